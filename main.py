@@ -20,6 +20,8 @@ from loguru import logger
 from src.core.agent import ObservabilityAgent
 from src.api.routes import router, set_agent
 from src.core.config import settings
+from src.integrations._http import close_session, create_session, set_session
+from src.integrations._threads import shutdown_executor
 
 # Load environment variables from .env file (for API keys, database URLs, etc.)
 load_dotenv()
@@ -49,6 +51,10 @@ async def lifespan(app: FastAPI):
         colorize=True
     )
     
+    # Each worker process builds its own HTTP connection pool up front, before
+    # the integration clients start, rather than on the first outgoing request
+    set_session(create_session())
+    
     # Initialize our main AI agent that does all the monitoring and analysis
     global agent
     agent = ObservabilityAgent()
@@ -61,6 +67,9 @@ async def lifespan(app: FastAPI):
     # Clean shutdown - stop the agent gracefully to avoid any hanging processes
     if agent:
         await agent.stop()
+    # The integration clients share one HTTP session - close it last
+    await close_session()
+    shutdown_executor()
     print("Application stopped")
 
 # Create our FastAPI application - this is the web server that handles everything
@@ -115,21 +124,21 @@ async def websocket_endpoint(websocket: WebSocket):
                     if status:
                         data_to_send = status
                 except Exception as status_error:
-                    logger.error(f"Couldn't get agent status: {status_error}")
+                    logger.error("Couldn't get agent status: {}", status_error)
             
             # Send the data, but only if the connection is still active
             try:
                 if websocket.client_state.name == "CONNECTED":
                     await websocket.send_json(data_to_send)
             except Exception as send_error:
-                logger.debug(f"WebSocket send failed: {send_error}")
+                logger.debug("WebSocket send failed: {}", send_error)
                 break
                 
             # Wait 5 seconds before the next update
             await asyncio.sleep(5)
             
     except Exception as e:
-        logger.debug(f"WebSocket connection ended: {e}")
+        logger.debug("WebSocket connection ended: {}", e)
     finally:
         # Clean up the connection safely
         try:
@@ -165,6 +174,10 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        # "auto" picks uvloop and httptools when they're installed (see requirements.txt)
+        # and quietly falls back to asyncio/h11 where they aren't, e.g. uvloop on Windows
+        loop="auto",
+        http="auto",
         log_level="warning",
         access_log=False  # Skip HTTP request logs to keep things clean
     )
@@ -775,4 +775,4 @@ if __name__ == "__main__":
     print("- Interactive dashboard")
     print("=" * 50)
     
-    uvicorn.run(app, host="0.0.0.0", port=8080, log_level="info")
+    uvicorn.run(app, host="0.0.0.0", port=8080, log_level="info", loop="auto", http="auto")
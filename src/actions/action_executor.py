@@ -5,7 +5,7 @@ Executes automated remediation actions based on incident analysis
 
 import asyncio
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
 from loguru import logger
 import json
 
@@ -31,7 +31,7 @@ class ActionExecutor:
             await self.slack_client.initialize()
             logger.info("Action executor initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize action executor: {e}")
+            logger.error("Failed to initialize action executor: {}", e)
     
     async def cleanup(self):
         """Cleanup resources"""
@@ -44,7 +44,7 @@ class ActionExecutor:
         actions = []
         
         try:
-            logger.debug(f"Executing actions for incident {incident.id}")
+            logger.debug("Executing actions for incident {}", incident.id)
             
             # Determine which actions to take based on analysis
             action_plan = self._determine_actions(incident)
@@ -75,12 +75,12 @@ class ActionExecutor:
                     if isinstance(result, Action):
                         actions.append(result)
                     elif isinstance(result, Exception):
-                        logger.error(f"Action execution failed: {result}")
+                        logger.error("Action execution failed: {}", result)
             
-            logger.debug(f"Executed {len(actions)} actions for incident {incident.id}")
+            logger.debug("Executed {} actions for incident {}", len(actions), incident.id)
             
         except Exception as e:
-            logger.error(f"Error executing actions for incident {incident.id}: {e}")
+            logger.error("Error executing actions for incident {}: {}", incident.id, e)
         
         return actions
     
@@ -115,7 +115,7 @@ class ActionExecutor:
             action_plan["create_github_issue"] = True
         
         # Suggest rollback for deployment-related high-severity issues
-        severity_value = getattr(incident.severity, 'value', incident.severity)
+        severity_value = incident.severity_str
         if (analysis.related_deployments and 
             severity_value in ["high", "critical"] and
             analysis.confidence > 0.8):
@@ -138,19 +138,19 @@ class ActionExecutor:
             
             # Create ticket
             ticket = await self.jira_client.create_issue(ticket_data)
-            ticket_key = ticket.get("key", "UNKNOWN") if isinstance(ticket, dict) else str(ticket)
+            ticket_key = ticket.get("key", "UNKNOWN") if isinstance(ticket, Mapping) else str(ticket)
             
             action.result = {
                 "ticket_key": ticket_key,
                 "ticket_url": f"{settings.JIRA_SERVER}/browse/{ticket_key}"
             }
             
-            logger.debug(f"Created Jira ticket {ticket_key} for incident {incident.id}")
+            logger.debug("Created Jira ticket {} for incident {}", ticket_key, incident.id)
             
         except Exception as e:
             action.status = "failed"
             action.result = {"error": str(e)}
-            logger.error(f"Failed to create Jira ticket: {e}")
+            logger.error("Failed to create Jira ticket: {}", e)
         
         return action
     
@@ -189,12 +189,12 @@ class ActionExecutor:
             action.status = "completed"
             action.result = {"comments": comments_created}
             
-            logger.debug(f"Created {len(comments_created)} PR comments for incident {incident.id}")
+            logger.debug("Created {} PR comments for incident {}", len(comments_created), incident.id)
             
         except Exception as e:
             action.status = "failed"
             action.result = {"error": str(e)}
-            logger.error(f"Failed to create PR comments: {e}")
+            logger.error("Failed to create PR comments: {}", e)
         
         return action
     
@@ -207,6 +207,12 @@ class ActionExecutor:
             status="pending"
         )
         
+        # Don't build a message nobody will send
+        if not self.slack_client.enabled:
+            action.status = "skipped"
+            action.result = {"reason": "Slack not configured"}
+            return action
+        
         try:
             message = self._prepare_slack_message(incident)
             
@@ -224,12 +230,12 @@ class ActionExecutor:
             else:
                 action.result = {"success": bool(response)}
             
-            logger.debug(f"Sent Slack notification for incident {incident.id}")
+            logger.debug("Sent Slack notification for incident {}", incident.id)
             
         except Exception as e:
             action.status = "failed"
             action.result = {"error": str(e)}
-            logger.error(f"Failed to send Slack notification: {e}")
+            logger.error("Failed to send Slack notification: {}", e)
         
         return action
     
@@ -253,12 +259,12 @@ class ActionExecutor:
                 "issue_url": issue["html_url"]
             }
             
-            logger.debug(f"Created GitHub issue #{issue['number']} for incident {incident.id}")
+            logger.debug("Created GitHub issue #{} for incident {}", issue['number'], incident.id)
             
         except Exception as e:
             action.status = "failed"
             action.result = {"error": str(e)}
-            logger.error(f"Failed to create GitHub issue: {e}")
+            logger.error("Failed to create GitHub issue: {}", e)
         
         return action
     
@@ -277,6 +283,11 @@ class ActionExecutor:
                 action.result = {"reason": "No related deployments found"}
                 return action
             
+            if not self.slack_client.enabled:
+                action.status = "skipped"
+                action.result = {"reason": "Slack not configured"}
+                return action
+            
             # Create rollback suggestion message
             rollback_message = self._prepare_rollback_message(incident)
             
@@ -293,12 +304,12 @@ class ActionExecutor:
                 "deployments": incident.analysis.related_deployments
             }
             
-            logger.debug(f"Suggested rollback for incident {incident.id}")
+            logger.debug("Suggested rollback for incident {}", incident.id)
             
         except Exception as e:
             action.status = "failed"
             action.result = {"error": str(e)}
-            logger.error(f"Failed to suggest rollback: {e}")
+            logger.error("Failed to suggest rollback: {}", e)
         
         return action
     
@@ -309,7 +320,7 @@ class ActionExecutor:
         description = f"""
 *Incident Details:*
 - ID: {incident.id}
-- Severity: {getattr(incident.severity, 'value', incident.severity).upper()}
+- Severity: {incident.severity_str.upper()}
 - Created: {incident.created_at.strftime('%Y-%m-%d %H:%M:%S UTC')}
 
 *Description:*
@@ -320,7 +331,7 @@ class ActionExecutor:
         
         for i, signal in enumerate(incident.signals, 1):
             description += f"""
-{i}. *{getattr(signal.type, 'value', signal.type).title()}* from {signal.source}
+{i}. *{signal.type.value.title()}* from {signal.source}
    - Component: {signal.component or 'Unknown'}
    - Time: {signal.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}
    - Details: {signal.description}
@@ -347,11 +358,11 @@ class ActionExecutor:
         
         return {
             "project": {"key": "OBS"},  # Configure project key
-            "summary": f"[{getattr(incident.severity, 'value', incident.severity).upper()}] {incident.title}",
+            "summary": f"[{incident.severity_str.upper()}] {incident.title}",
             "description": description,
             "issuetype": {"name": "Bug"},
             "priority": {"name": self._map_severity_to_jira_priority(incident.severity)},
-            "labels": ["observability-agent", "auto-created", getattr(incident.severity, 'value', incident.severity)]
+            "labels": ["observability-agent", "auto-created", incident.severity_str]
         }
     
     def _prepare_pr_comment(self, incident: Incident, pr: Dict[str, Any]) -> str:
@@ -363,7 +374,7 @@ class ActionExecutor:
 This PR may be related to incident **{incident.id}** detected in production.
 
 **Incident Details:**
-- **Severity:** {getattr(incident.severity, 'value', incident.severity).upper()}
+- **Severity:** {incident.severity_str.upper()}
 - **Description:** {incident.description}
 - **Detected:** {incident.created_at.strftime('%Y-%m-%d %H:%M:%S UTC')}
 """
@@ -400,7 +411,7 @@ This PR may be related to incident **{incident.id}** detected in production.
             "high": "warning", 
             "medium": "#ff9900",
             "low": "good"
-        }.get(getattr(incident.severity, 'value', incident.severity), "#808080")
+        }.get(incident.severity_str, "#808080")
         
         fields = [
             {
@@ -410,12 +421,12 @@ This PR may be related to incident **{incident.id}** detected in production.
             },
             {
                 "title": "Severity",
-                "value": getattr(incident.severity, 'value', incident.severity).upper(),
+                "value": incident.severity_str.upper(),
                 "short": True
             },
             {
                 "title": "Status",
-                "value": getattr(incident.status, 'value', incident.status).title(),
+                "value": incident.status_str.title(),
                 "short": True
             }
         ]
@@ -453,8 +464,8 @@ This PR may be related to incident **{incident.id}** detected in production.
         
         body = f"""## Incident Report: {incident.id}
 
-**Severity:** {getattr(incident.severity, 'value', incident.severity).upper()}
-**Status:** {getattr(incident.status, 'value', incident.status).title()}
+**Severity:** {incident.severity_str.upper()}
+**Status:** {incident.status_str.title()}
 **Created:** {incident.created_at.strftime('%Y-%m-%d %H:%M:%S UTC')}
 
 ### Description
@@ -465,7 +476,7 @@ This PR may be related to incident **{incident.id}** detected in production.
         
         for signal in incident.signals:
             body += f"""
-- **{getattr(signal.type, 'value', signal.type).title()}** from `{signal.source}`
+- **{signal.type.value.title()}** from `{signal.source}`
   - Component: `{signal.component or 'Unknown'}`
   - Time: {signal.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}
   - Details: {signal.description}
@@ -496,12 +507,12 @@ This PR may be related to incident **{incident.id}** detected in production.
 *This issue was automatically created by the CopadoCon 2025 Hackathon.*
 """
         
-        labels = ["observability", "auto-created", getattr(incident.severity, 'value', incident.severity)]
+        labels = ["observability", "auto-created", incident.severity_str]
         if analysis and analysis.related_commits:
             labels.append("deployment-related")
         
         return {
-            "title": f"[{getattr(incident.severity, 'value', incident.severity).upper()}] {incident.title}",
+            "title": f"[{incident.severity_str.upper()}] {incident.title}",
             "body": body,
             "labels": labels
         }
@@ -519,7 +530,7 @@ This PR may be related to incident **{incident.id}** detected in production.
                     "fields": [
                         {
                             "title": "Severity",
-                            "value": getattr(incident.severity, 'value', incident.severity).upper(),
+                            "value": incident.severity_str.upper(),
                             "short": True
                         },
                         {
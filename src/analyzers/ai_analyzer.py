@@ -4,7 +4,7 @@ Uses AI to perform intelligent root cause analysis and correlation
 """
 
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 from loguru import logger
 import json
@@ -47,7 +47,7 @@ class AIAnalyzer:
                 logger.warning("OpenAI API key not configured - using fallback analysis")
                 
         except Exception as e:
-            logger.error(f"Failed to initialize AI analyzer: {e}")
+            logger.error("Failed to initialize AI analyzer: {}", e)
     
     async def cleanup(self):
         """Cleanup resources"""
@@ -56,7 +56,7 @@ class AIAnalyzer:
     async def analyze_incident(self, incident: Incident) -> Analysis:
         """Perform comprehensive AI analysis of an incident"""
         try:
-            logger.debug(f"Analyzing incident {incident.id}")
+            logger.debug("Analyzing incident {}", incident.id)
             
             # Gather context data
             context = await self._gather_context(incident)
@@ -67,15 +67,15 @@ class AIAnalyzer:
             else:
                 analysis = await self._fallback_analysis(incident, context)
             
-            logger.debug(f"Analysis completed for {incident.id} with confidence {analysis.confidence}")
+            logger.debug("Analysis completed for {} with confidence {}", incident.id, analysis.confidence)
             return analysis
             
         except Exception as e:
-            logger.error(f"Error analyzing incident {incident.id}: {e}")
+            logger.error("Error analyzing incident {}: {}", incident.id, e)
             return Analysis(
                 root_cause="Analysis failed due to error",
                 confidence=0.0,
-                analysis_timestamp=datetime.utcnow()
+                analysis_timestamp=datetime.now(timezone.utc)
             )
     
     async def _gather_context(self, incident: Incident) -> Dict[str, Any]:
@@ -112,7 +112,7 @@ class AIAnalyzer:
             context["similar_incidents"] = similar
             
         except Exception as e:
-            logger.error(f"Error gathering context: {e}")
+            logger.error("Error gathering context: {}", e)
         
         return context
     
@@ -146,7 +146,7 @@ class AIAnalyzer:
             return analysis
             
         except Exception as e:
-            logger.error(f"AI analysis failed: {e}")
+            logger.error("AI analysis failed: {}", e)
             return await self._fallback_analysis(incident, context)
     
     async def _fallback_analysis(self, incident: Incident, context: Dict[str, Any]) -> Analysis:
@@ -193,7 +193,7 @@ class AIAnalyzer:
             analysis.related_commits = [c["sha"] for c in context.get("recent_commits", [])]
             
         except Exception as e:
-            logger.error(f"Fallback analysis failed: {e}")
+            logger.error("Fallback analysis failed: {}", e)
             analysis.root_cause = "Analysis failed"
             analysis.confidence = 0.0
         
@@ -208,7 +208,7 @@ INCIDENT DETAILS:
 - ID: {incident.id}
 - Title: {incident.title}
 - Description: {incident.description}
-- Severity: {incident.severity.value}
+- Severity: {incident.severity}
 - Created: {incident.created_at}
 
 SIGNALS:
@@ -278,22 +278,22 @@ Please provide your analysis in the following JSON format:
                     suggested_actions=response_data.get("suggested_actions", []),
                     code_changes=response_data.get("code_changes", []),
                     impact_assessment=response_data.get("impact_assessment"),
-                    analysis_timestamp=datetime.utcnow()
+                    analysis_timestamp=datetime.now(timezone.utc)
                 )
             else:
                 # Fallback parsing
                 return Analysis(
                     root_cause=ai_response[:500],  # First 500 chars as root cause
                     confidence=0.5,
-                    analysis_timestamp=datetime.utcnow()
+                    analysis_timestamp=datetime.now(timezone.utc)
                 )
                 
         except Exception as e:
-            logger.error(f"Failed to parse AI response: {e}")
+            logger.error("Failed to parse AI response: {}", e)
             return Analysis(
                 root_cause="Failed to parse AI analysis",
                 confidence=0.0,
-                analysis_timestamp=datetime.utcnow()
+                analysis_timestamp=datetime.now(timezone.utc)
             )
     
     async def _analyze_code_changes(self, signal: Signal, commits: List[Dict]) -> List[Dict[str, Any]]:
@@ -333,7 +333,7 @@ Please provide your analysis in the following JSON format:
                     })
                     
         except Exception as e:
-            logger.error(f"Error analyzing code changes: {e}")
+            logger.error("Error analyzing code changes: {}", e)
         
         return related_changes
     
@@ -362,7 +362,7 @@ Please provide your analysis in the following JSON format:
                     if 0 < time_diff < 3600:  # Within 1 hour after deployment
                         return deployment["Id"]
             except (ValueError, AttributeError) as e:
-                logger.debug(f"Error parsing deployment time: {e}")
+                logger.debug("Error parsing deployment time: {}", e)
                 continue
         
         return None
@@ -407,7 +407,6 @@ Please provide your analysis in the following JSON format:
         timestamps = [s.timestamp for s in incident.signals]
         if len(timestamps) > 1:
             # Ensure all timestamps are timezone-aware for comparison
-            from datetime import timezone
             normalized_timestamps = []
             for ts in timestamps:
                 if ts.tzinfo is None:
@@ -4,17 +4,58 @@ These are all the web endpoints that power our dashboard and let external system
 Think of this as the public interface - how the outside world interacts with our AI agent.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
 from fastapi.responses import JSONResponse
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import heapq
+import hmac
 import json
+import os
+import platform
+import time
+import orjson
 
-from ..models.incident import Incident, Signal, Analysis
+from ..models.incident import Incident, IncidentStatus, Signal, Analysis
 from ..core.agent import ObservabilityAgent
+from ..core.config import settings
+from ..integrations.github_client import GitHubClient
+from ..integrations._threads import run_blocking
 
 router = APIRouter()
 
+# These never change while the process is alive, so work them out once
+_PLATFORM = {
+    "platform": platform.system(),
+    "python_version": platform.python_version()
+}
+
+# The parts of the /health response that are the same on every call
+_HEALTH_BASE = {
+    "status": "healthy",
+    "version": "1.0.0",
+    "service": "CopadoCon 2025 Hackathon"
+}
+
+class UTCJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson.
+    Datetimes can be handed over as-is - orjson serializes them natively
+    and OPT_UTC_Z writes UTC offsets as a trailing 'Z'.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+# Which model fields each endpoint exposes. raw_data is the untouched source
+# payload, which is only useful internally, so it never goes out over the API.
+_INCIDENT_SUMMARY_FIELDS = {
+    "id", "title", "description", "severity", "status",
+    "created_at", "updated_at", "resolved_at"
+}
+_SIGNAL_EXCLUDE = {"raw_data"}
+_INCIDENT_DETAIL_EXCLUDE = {"signals": {"__all__": _SIGNAL_EXCLUDE}}
+
 # Keep a reference to our main AI agent so we can use it in our endpoints
 agent: Optional[ObservabilityAgent] = None
 
@@ -26,6 +67,42 @@ def set_agent(agent_instance: ObservabilityAgent):
     global agent
     agent = agent_instance
 
+def _gather_system_metrics():
+    """
+    Collect the raw system stats for /health in one go.
+    This is plain blocking psutil work, so callers should run it off the event loop.
+    """
+    import psutil
+    
+    # Get current system performance stats (safely, in case something fails)
+    try:
+        cpu_percent = psutil.cpu_percent(interval=0.1)
+    except:
+        cpu_percent = 0.0  # If we can't get CPU info, just say 0
+        
+    try:
+        memory = psutil.virtual_memory()
+    except:
+        # Create a fake memory object if the real one fails
+        memory = type('obj', (object,), {'total': 0, 'available': 0, 'percent': 0})()
+        
+    try:
+        # Check disk space (handle Windows vs Linux paths)
+        disk = psutil.disk_usage('.' if os.name == 'nt' else '/')
+    except:
+        # Fake disk object if that fails too
+        disk = type('obj', (object,), {'total': 0, 'free': 0, 'used': 0})()
+    
+    # Figure out how long we've been running
+    try:
+        process = psutil.Process()
+        with process.oneshot():
+            uptime_seconds = time.time() - process.create_time()
+    except:
+        uptime_seconds = 0.0
+    
+    return cpu_percent, memory, disk, uptime_seconds
+
 @router.get("/health")
 async def health_check():
     """
@@ -36,48 +113,19 @@ async def health_check():
     Perfect for monitoring tools or just checking if everything's okay.
     """
     try:
-        import psutil
-        import platform
-        import time
-        import os
-        
-        # Get current system performance stats (safely, in case something fails)
-        try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-        except:
-            cpu_percent = 0.0  # If we can't get CPU info, just say 0
-            
-        try:
-            memory = psutil.virtual_memory()
-        except:
-            # Create a fake memory object if the real one fails
-            memory = type('obj', (object,), {'total': 0, 'available': 0, 'percent': 0})()
-            
-        try:
-            # Check disk space (handle Windows vs Linux paths)
-            disk = psutil.disk_usage('.' if os.name == 'nt' else '/')
-        except:
-            # Fake disk object if that fails too
-            disk = type('obj', (object,), {'total': 0, 'free': 0, 'used': 0})()
-        
-        # Figure out how long we've been running
-        try:
-            uptime_seconds = time.time() - psutil.Process().create_time()
-        except:
-            uptime_seconds = 0.0
+        # psutil calls block (cpu_percent sleeps for its sampling interval),
+        # so collect everything on the integration pool to keep the event loop free
+        cpu_percent, memory, disk, uptime_seconds = await run_blocking(_gather_system_metrics)
         
         return {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "version": "1.0.0",
-            "service": "CopadoCon 2025 Hackathon",
+            **_HEALTH_BASE,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "uptime": {
                 "seconds": round(uptime_seconds, 2),
                 "human_readable": f"{int(uptime_seconds // 3600)}h {int((uptime_seconds % 3600) // 60)}m {int(uptime_seconds % 60)}s"
             },
             "system": {
-                "platform": platform.system(),
-                "python_version": platform.python_version(),
+                **_PLATFORM,
                 "cpu_usage_percent": cpu_percent,
                 "memory": {
                     "total_gb": round(memory.total / (1024**3), 2) if memory.total > 0 else 0,
@@ -99,10 +147,8 @@ async def health_check():
     except Exception as e:
         # Fallback response if system metrics fail
         return {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "version": "1.0.0",
-            "service": "CopadoCon 2025 Hackathon",
+            **_HEALTH_BASE,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "error": f"System metrics unavailable: {str(e)}",
             "services": {
                 "agent_running": agent.is_running if agent else False,
@@ -123,7 +169,7 @@ async def get_agent_status():
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
     status = await agent.get_status()
-    return JSONResponse(content=status)
+    return UTCJSONResponse(content=status)
 
 @router.get("/incidents")
 async def get_incidents(
@@ -141,15 +187,17 @@ async def get_incidents(
     if not agent:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
-    # Start with all the incidents we know about
-    incidents = list(agent.active_incidents.values())
-    
-    # Filter down to what the user actually wants to see
-    if status:
-        incidents = [inc for inc in incidents if getattr(inc.status, 'value', inc.status) == status]
-    
-    if severity:
-        incidents = [inc for inc in incidents if getattr(inc.severity, 'value', inc.severity) == severity]
+    # Filter down to what the user actually wants to see, in a single pass
+    # and only checking the filters that were actually given
+    if status and severity:
+        incidents = [inc for inc in agent.active_incidents.values()
+                     if inc.status_str == status and inc.severity_str == severity]
+    elif status:
+        incidents = [inc for inc in agent.active_incidents.values() if inc.status_str == status]
+    elif severity:
+        incidents = [inc for inc in agent.active_incidents.values() if inc.severity_str == severity]
+    else:
+        incidents = list(agent.active_incidents.values())
     
     # Show newest stuff first (because that's usually what people care about)
     incidents.sort(key=lambda x: x.created_at, reverse=True)
@@ -157,25 +205,19 @@ async def get_incidents(
     # Don't overwhelm the dashboard with too many results
     incidents = incidents[:limit]
     
-    # Convert to dict format
-    result = []
-    for incident in incidents:
-        incident_dict = {
-            "id": incident.id,
-            "title": incident.title,
-            "description": incident.description,
-            "severity": getattr(incident.severity, 'value', incident.severity),
-            "status": getattr(incident.status, 'value', incident.status),
-            "created_at": incident.created_at.isoformat(),
-            "updated_at": incident.updated_at.isoformat(),
-            "resolved_at": incident.resolved_at.isoformat() if incident.resolved_at else None,
+    # Convert to dict format - pydantic does the field copying and the
+    # enum/datetime conversion in one go
+    result = [
+        {
+            **incident.model_dump(mode="json", include=_INCIDENT_SUMMARY_FIELDS),
             "signals_count": len(incident.signals),
             "actions_count": len(incident.actions_taken),
             "confidence": incident.analysis.confidence if incident.analysis else 0.0
         }
-        result.append(incident_dict)
+        for incident in incidents
+    ]
     
-    return JSONResponse(content={"incidents": result, "total": len(result)})
+    return UTCJSONResponse(content={"incidents": result, "total": len(result)})
 
 @router.get("/incidents/{incident_id}")
 async def get_incident_details(incident_id: str):
@@ -187,55 +229,10 @@ async def get_incident_details(incident_id: str):
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     
-    # Convert to detailed dict format
-    incident_dict = {
-        "id": incident.id,
-        "title": incident.title,
-        "description": incident.description,
-        "severity": getattr(incident.severity, 'value', incident.severity),
-        "status": getattr(incident.status, 'value', incident.status),
-        "created_at": incident.created_at.isoformat(),
-        "updated_at": incident.updated_at.isoformat(),
-        "resolved_at": incident.resolved_at.isoformat() if incident.resolved_at else None,
-        "assignee": incident.assignee,
-        "tags": incident.tags,
-        "signals": [
-            {
-                "id": signal.id,
-                "type": getattr(signal.type, 'value', signal.type),
-                "source": signal.source,
-                "component": signal.component,
-                "description": signal.description,
-                "severity": getattr(signal.severity, 'value', signal.severity),
-                "timestamp": signal.timestamp.isoformat(),
-                "metadata": signal.metadata
-            }
-            for signal in incident.signals
-        ],
-        "analysis": {
-            "root_cause": incident.analysis.root_cause,
-            "confidence": incident.analysis.confidence,
-            "related_deployments": incident.analysis.related_deployments,
-            "related_commits": incident.analysis.related_commits,
-            "suggested_actions": incident.analysis.suggested_actions,
-            "code_changes": incident.analysis.code_changes,
-            "impact_assessment": incident.analysis.impact_assessment,
-            "analysis_timestamp": incident.analysis.analysis_timestamp.isoformat()
-        } if incident.analysis else None,
-        "actions_taken": [
-            {
-                "id": action.id,
-                "type": action.type,
-                "description": action.description,
-                "status": action.status,
-                "result": action.result,
-                "timestamp": action.timestamp.isoformat()
-            }
-            for action in incident.actions_taken
-        ]
-    }
+    # Convert to detailed dict format (everything except the raw signal payloads)
+    incident_dict = incident.model_dump(mode="json", exclude=_INCIDENT_DETAIL_EXCLUDE)
     
-    return JSONResponse(content=incident_dict)
+    return UTCJSONResponse(content=incident_dict)
 
 @router.post("/incidents/{incident_id}/resolve")
 async def resolve_incident(incident_id: str):
@@ -247,11 +244,12 @@ async def resolve_incident(incident_id: str):
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     
-    incident.status = incident.status.RESOLVED
-    incident.resolved_at = datetime.utcnow()
-    incident.updated_at = datetime.utcnow()
+    now = datetime.now(timezone.utc)
+    incident.status = IncidentStatus.RESOLVED
+    incident.resolved_at = now
+    incident.updated_at = now
     
-    return JSONResponse(content={"message": "Incident resolved successfully"})
+    return UTCJSONResponse(content={"message": "Incident resolved successfully"})
 
 @router.get("/metrics")
 async def get_metrics():
@@ -260,14 +258,15 @@ async def get_metrics():
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
     incidents = list(agent.active_incidents.values())
+    now = datetime.now(timezone.utc)
     
     # Calculate metrics
     total_incidents = len(incidents)
-    resolved_incidents = len([inc for inc in incidents if getattr(inc.status, 'value', inc.status) == "resolved"])
+    resolved_incidents = sum(1 for inc in incidents if inc.status_str == "resolved")
     
     severity_counts = {}
     for incident in incidents:
-        severity = getattr(incident.severity, 'value', incident.severity)
+        severity = incident.severity_str
         severity_counts[severity] = severity_counts.get(severity, 0) + 1
     
     # Calculate average resolution time for resolved incidents
@@ -280,7 +279,7 @@ async def get_metrics():
     avg_resolution_time = sum(resolution_times) / len(resolution_times) if resolution_times else 0
     
     # Recent activity (last 24 hours)
-    recent_cutoff = datetime.utcnow() - timedelta(hours=24)
+    recent_cutoff = now - timedelta(hours=24)
     recent_incidents = [inc for inc in incidents if inc.created_at >= recent_cutoff]
     
     metrics = {
@@ -291,10 +290,15 @@ async def get_metrics():
         "severity_distribution": severity_counts,
         "average_resolution_time_seconds": avg_resolution_time,
         "recent_incidents_24h": len(recent_incidents),
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": now
     }
     
-    return JSONResponse(content=metrics)
+    return UTCJSONResponse(content=metrics)
+
+def _signal_age_key(entry) -> datetime:
+    """Sort key for (signal, incident_id) pairs - naive timestamps are treated as UTC"""
+    timestamp = entry[0].timestamp
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
 
 @router.get("/signals")
 async def get_recent_signals(limit: int = 100):
@@ -302,42 +306,66 @@ async def get_recent_signals(limit: int = 100):
     if not agent:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
-    all_signals = []
-    for incident in agent.active_incidents.values():
-        for signal in incident.signals:
-            signal_dict = {
-                "id": signal.id,
-                "incident_id": incident.id,
-                "type": getattr(signal.type, 'value', signal.type),
-                "source": signal.source,
-                "component": signal.component,
-                "description": signal.description,
-                "severity": getattr(signal.severity, 'value', signal.severity),
-                "timestamp": signal.timestamp.isoformat(),
-                "metadata": signal.metadata
-            }
-            all_signals.append(signal_dict)
-    
-    # Sort by timestamp (newest first)
-    all_signals.sort(key=lambda x: x["timestamp"], reverse=True)
+    # Only the newest `limit` signals are returned, so pick those out without
+    # sorting (or serializing) everything else
+    newest = heapq.nlargest(
+        limit,
+        ((signal, incident.id) for incident in agent.active_incidents.values() for signal in incident.signals),
+        key=_signal_age_key
+    )
     
-    # Limit results
-    all_signals = all_signals[:limit]
+    all_signals = [
+        {**signal.model_dump(mode="json", exclude=_SIGNAL_EXCLUDE), "incident_id": incident_id}
+        for signal, incident_id in newest
+    ]
     
-    return JSONResponse(content={"signals": all_signals, "total": len(all_signals)})
+    return UTCJSONResponse(content={"signals": all_signals, "total": len(all_signals)})
+
+def _valid_github_signature(body: bytes, signature: str) -> bool:
+    """Check a webhook's X-Hub-Signature-256 header against our webhook secret"""
+    expected = "sha256=" + hmac.new(settings.GITHUB_WEBHOOK_SECRET.encode(), body, "sha256").hexdigest()
+    return hmac.compare_digest(expected, signature)
 
 @router.post("/webhook/github")
-async def github_webhook(background_tasks: BackgroundTasks):
-    """Handle GitHub webhook events"""
-    # This would process GitHub webhook events
-    # For now, just acknowledge receipt
-    return JSONResponse(content={"message": "Webhook received"})
+async def github_webhook(request: Request):
+    """
+    Handle GitHub webhook events.
+    
+    Failed deployment_status events are queued for the signal detector, which
+    picks them up on its next tick. With GITHUB_WEBHOOKS_ENABLED off the
+    detector polls GitHub instead, so those events are dropped with a 202.
+    Every other event is just acknowledged.
+    """
+    body = await request.body()
+    
+    if settings.GITHUB_WEBHOOK_SECRET and not _valid_github_signature(
+        body, request.headers.get("X-Hub-Signature-256", "")
+    ):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    
+    if request.headers.get("X-GitHub-Event") == "deployment_status":
+        try:
+            deployment = GitHubClient.failed_deployment_from_event(orjson.loads(body))
+        except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError):
+            raise HTTPException(status_code=400, detail="Malformed deployment_status payload")
+        
+        if not settings.GITHUB_WEBHOOKS_ENABLED:
+            # Nothing would ever drain the queue - the detector is polling GitHub
+            return UTCJSONResponse(
+                status_code=202,
+                content={"message": "Webhook ignored - GITHUB_WEBHOOKS_ENABLED is off"}
+            )
+        
+        if deployment and agent:
+            agent.signal_detector.queue_github_deployment(deployment)
+    
+    return UTCJSONResponse(content={"message": "Webhook received"})
 
 @router.post("/webhook/deployment")
 async def deployment_webhook(background_tasks: BackgroundTasks):
     """Handle deployment webhook events"""
     # This would process deployment webhook events
-    return JSONResponse(content={"message": "Deployment webhook received"})
+    return UTCJSONResponse(content={"message": "Deployment webhook received"})
 
 @router.get("/config")
 async def get_configuration():
@@ -345,7 +373,7 @@ async def get_configuration():
     config = {
         "integrations": {
             "salesforce": bool(agent.signal_detector.salesforce_client.sf) if agent else False,
-            "github": bool(agent.signal_detector.github_client.github) if agent else False,
+            "github": bool(agent.signal_detector.github_client.session) if agent else False,
             "jira": bool(agent.action_executor.jira_client.jira) if agent else False,
             "slack": bool(agent.action_executor.slack_client.session) if agent else False
         },
@@ -355,4 +383,4 @@ async def get_configuration():
         }
     }
     
-    return JSONResponse(content=config)
+    return UTCJSONResponse(content=config)
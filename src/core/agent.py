@@ -7,7 +7,7 @@ of an orchestra - it doesn't play the instruments but makes sure they all work t
 """
 
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from loguru import logger
 
@@ -87,7 +87,7 @@ class ObservabilityAgent:
                     await self._process_signal(signal)
                     
             except Exception as e:
-                logger.error(f"Something went wrong in the monitoring loop: {e}")
+                logger.error("Something went wrong in the monitoring loop: {}", e)
                 
             # Take a breather before checking again
             await asyncio.sleep(settings.MONITORING_INTERVAL)
@@ -101,7 +101,7 @@ class ObservabilityAgent:
         if we're confident about what went wrong.
         """
         try:
-            logger.debug(f"Processing signal: {signal.type} - {signal.description}")
+            logger.debug("Processing signal: {} - {}", signal.type, signal.description)
             
             # Either create a new incident or add this to an existing one
             incident = await self._create_or_update_incident(signal)
@@ -122,10 +122,10 @@ class ObservabilityAgent:
             # Save our work
             self.active_incidents[incident.id] = incident
             
-            logger.debug(f"Incident {incident.id} processed with confidence {analysis.confidence}")
+            logger.debug("Incident {} processed with confidence {}", incident.id, analysis.confidence)
             
         except Exception as e:
-            logger.error(f"Error processing signal: {e}")
+            logger.error("Error processing signal: {}", e)
     
     async def _create_or_update_incident(self, signal) -> Incident:
         """
@@ -134,24 +134,26 @@ class ObservabilityAgent:
         Sometimes multiple signals are actually the same underlying issue,
         so we group them together instead of creating duplicate incidents.
         """
+        now = datetime.now(timezone.utc)
+        
         # See if this signal is related to something we're already tracking
         for incident in self.active_incidents.values():
             if await self._signals_related(signal, incident):
                 # Add this signal to the existing incident
-                incident.signals.append(signal)
-                incident.updated_at = datetime.utcnow()
+                incident.add_signal(signal)
+                incident.updated_at = now
                 return incident
         
         # Create new incident
         incident = Incident(
-            id=f"INC-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}",
+            id=f"INC-{now.strftime('%Y%m%d-%H%M%S')}",
             title=f"{signal.type}: {signal.description}",
             description=signal.description,
-            severity=signal.severity,
+            severity=signal.severity.value,
             signals=[signal],
             status=IncidentStatus.DETECTED,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         
         return incident
@@ -159,11 +161,7 @@ class ObservabilityAgent:
     async def _signals_related(self, signal, incident) -> bool:
         """Check if a signal is related to an existing incident"""
         # Simple correlation logic - can be enhanced with ML
-        for existing_signal in incident.signals:
-            if (signal.source == existing_signal.source or 
-                signal.component == existing_signal.component):
-                return True
-        return False
+        return incident.matches_signal(signal)
     
     async def _check_incident_updates(self):
         """Check for updates on existing incidents"""
@@ -173,8 +171,8 @@ class ObservabilityAgent:
                 is_resolved = await self._check_if_resolved(incident)
                 if is_resolved:
                     incident.status = IncidentStatus.RESOLVED
-                    incident.resolved_at = datetime.utcnow()
-                    logger.info(f"Incident {incident.id} resolved")
+                    incident.resolved_at = datetime.now(timezone.utc)
+                    logger.info("Incident {} resolved", incident.id)
     
     async def _check_if_resolved(self, incident) -> bool:
         """Check if an incident is resolved"""
@@ -190,12 +188,12 @@ class ObservabilityAgent:
                 {
                     "id": inc.id,
                     "title": inc.title,
-                    "status": getattr(inc.status, 'value', inc.status),
-                    "severity": getattr(inc.severity, 'value', inc.severity),
+                    "status": inc.status_str,
+                    "severity": inc.severity_str,
                     "created_at": inc.created_at.isoformat(),
                     "confidence": inc.analysis.confidence if inc.analysis else 0
                 }
                 for inc in self.active_incidents.values()
             ],
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
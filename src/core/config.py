@@ -22,6 +22,8 @@ class Settings(BaseSettings):
     
     # How often our monitoring agent checks for new problems (in seconds)
     MONITORING_INTERVAL: int = int(os.getenv("MONITORING_INTERVAL", "30"))
+    # Ignore signals below this severity: low, medium, high or critical
+    MIN_SIGNAL_SEVERITY: str = os.getenv("MIN_SIGNAL_SEVERITY", "low")
     
     # Salesforce connection details - where we monitor for issues
     SALESFORCE_USERNAME: Optional[str] = os.getenv("SALESFORCE_USERNAME")
@@ -36,6 +38,12 @@ class Settings(BaseSettings):
     # GitHub integration for code-related incident tracking
     GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN")
     GITHUB_WEBHOOK_SECRET: Optional[str] = os.getenv("GITHUB_WEBHOOK_SECRET")
+    # The repository to watch, as "owner/name"
+    GITHUB_REPO: Optional[str] = os.getenv("GITHUB_REPO")
+    # Let GitHub push deployment_status events to /api/webhook/github instead of polling for them
+    GITHUB_WEBHOOKS_ENABLED: bool = os.getenv("GITHUB_WEBHOOKS_ENABLED", "false").lower() == "true"
+    # Only watch deployments to this environment (e.g. "production"); empty means all
+    GITHUB_DEPLOYMENT_ENVIRONMENT: Optional[str] = os.getenv("GITHUB_DEPLOYMENT_ENVIRONMENT")
     
     # Jira integration for creating and managing tickets
     JIRA_SERVER: Optional[str] = os.getenv("JIRA_SERVER")
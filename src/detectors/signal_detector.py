@@ -4,10 +4,11 @@ Monitors various sources for issues and anomalies
 """
 
 import asyncio
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional
 from loguru import logger
-import json
 
 from ..models.incident import Signal, SignalType, Severity
 from ..integrations.salesforce_client import SalesforceClient
@@ -15,62 +16,139 @@ from ..integrations.github_client import GitHubClient
 from ..integrations.monitoring_client import MonitoringClient
 from ..core.config import settings
 
+# Optional import - ciso8601 is a C parser that's much faster than the pure
+# Python route when a poll returns hundreds of rows
+try:
+    from ciso8601 import parse_datetime as _parse_ts
+except ImportError:
+    if sys.version_info >= (3, 11):
+        # fromisoformat is C code too, and from 3.11 it understands the 'Z' and
+        # '+0000' offsets GitHub and Salesforce send - no wrapper needed per row
+        _parse_ts = datetime.fromisoformat
+    else:
+        def _parse_ts(value: str) -> datetime:
+            """Parse an ISO-8601 timestamp, accepting a trailing 'Z' for UTC"""
+            if value.endswith('Z'):
+                value = value[:-1] + '+00:00'
+            return datetime.fromisoformat(value)
+
+# Keywords that bump an error's severity. Matching is by substring, so
+# "exception" also catches "NullPointerException".
+_SEVERITY_KEYWORDS = {
+    'critical': Severity.CRITICAL,
+    'fatal': Severity.CRITICAL,
+    'system': Severity.CRITICAL,
+    'error': Severity.HIGH,
+    'exception': Severity.HIGH,
+    'fail': Severity.HIGH,
+    'warning': Severity.MEDIUM,
+    'deprecated': Severity.MEDIUM
+}
+_SEVERITY_KEYWORD_RE = re.compile('|'.join(_SEVERITY_KEYWORDS))
+
+# Severity values are strings, so ordering comes from this table
+_SEVERITY_RANK = {
+    Severity.LOW: 0,
+    Severity.MEDIUM: 1,
+    Severity.HIGH: 2,
+    Severity.CRITICAL: 3
+}
+
+# Monitoring alert severities -> our severity levels (anything else is MEDIUM)
+_ALERT_SEVERITIES = {
+    'critical': Severity.CRITICAL,
+    'high': Severity.HIGH,
+    'medium': Severity.MEDIUM,
+    'low': Severity.LOW,
+    'warning': Severity.MEDIUM,
+    'error': Severity.HIGH
+}
+
+# Webhook deployments waiting for the next tick; more than this and new ones are dropped
+_GITHUB_EVENT_QUEUE_SIZE = 1000
+
 class SignalDetector:
     """Detects signals from various monitoring sources"""
     
+    _SOURCES = ("salesforce", "github", "monitoring", "logs")
+    
     def __init__(self):
         self.salesforce_client = SalesforceClient()
         self.github_client = GitHubClient()
         self.monitoring_client = MonitoringClient()
-        self.last_check_time = datetime.utcnow() - timedelta(hours=1)
+        # Tracked per source so one failing source doesn't make the others
+        # re-fetch (and re-signal) rows they already handled
+        start_time = datetime.now(timezone.utc) - timedelta(hours=1)
+        self.last_check_time = {source: start_time for source in self._SOURCES}
+        
+        # Failed deployments pushed by GitHub webhooks, drained on every tick
+        self.github_events: asyncio.Queue = asyncio.Queue(maxsize=_GITHUB_EVENT_QUEUE_SIZE)
+        
+        try:
+            self.min_severity_rank = _SEVERITY_RANK[Severity(settings.MIN_SIGNAL_SEVERITY.lower())]
+        except ValueError:
+            logger.warning("Unknown MIN_SIGNAL_SEVERITY '{}' - keeping all signals", settings.MIN_SIGNAL_SEVERITY)
+            self.min_severity_rank = _SEVERITY_RANK[Severity.LOW]
         
     async def initialize(self):
         """Initialize all detection clients"""
-        try:
-            await self.salesforce_client.initialize()
-            await self.github_client.initialize()
-            await self.monitoring_client.initialize()
+        # The clients are independent, so bring them up concurrently
+        results = await asyncio.gather(
+            self.salesforce_client.initialize(),
+            self.github_client.initialize(),
+            self.monitoring_client.initialize(),
+            return_exceptions=True
+        )
+        
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            for failure in failures:
+                logger.error("Failed to initialize signal detector: {}", failure)
+        else:
             logger.info("Signal detector initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize signal detector: {e}")
     
     async def cleanup(self):
         """Cleanup resources"""
-        await self.salesforce_client.cleanup()
-        await self.github_client.cleanup()
-        await self.monitoring_client.cleanup()
+        results = await asyncio.gather(
+            self.salesforce_client.cleanup(),
+            self.github_client.cleanup(),
+            self.monitoring_client.cleanup(),
+            return_exceptions=True
+        )
+        
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error cleaning up signal detector: {}", result)
     
     async def detect_signals(self) -> List[Signal]:
         """Detect signals from all sources"""
         signals = []
-        current_time = datetime.utcnow()
+        current_time = datetime.now(timezone.utc)
         
         try:
-            # Detect Salesforce errors
-            sf_signals = await self._detect_salesforce_signals()
-            signals.extend(sf_signals)
-            
-            # Detect deployment issues
-            deploy_signals = await self._detect_deployment_signals()
-            signals.extend(deploy_signals)
-            
-            # Detect test failures
-            test_signals = await self._detect_test_failures()
-            signals.extend(test_signals)
-            
-            # Detect monitoring alerts
-            monitor_signals = await self._detect_monitoring_alerts()
-            signals.extend(monitor_signals)
+            # Every source is an independent network call, so poll them all at
+            # once - a tick now takes as long as the slowest source, not the sum.
+            # Results come back in the same order as _SOURCES.
+            results = await asyncio.gather(
+                self._detect_salesforce_signals(),
+                self._detect_github_deployments(),
+                self._detect_monitoring_alerts(),
+                self._detect_log_anomalies(),
+                return_exceptions=True
+            )
             
-            # Detect log anomalies
-            log_signals = await self._detect_log_anomalies()
-            signals.extend(log_signals)
+            # Only move a source's window forward once it has been read successfully
+            for source, result in zip(self._SOURCES, results):
+                if isinstance(result, Exception):
+                    logger.error("Error detecting {} signals: {}", source, result)
+                else:
+                    signals.extend(result)
+                    self.last_check_time[source] = current_time
             
-            self.last_check_time = current_time
-            logger.debug(f"Detected {len(signals)} signals")
+            logger.debug("Detected {} signals", len(signals))
             
         except Exception as e:
-            logger.error(f"Error detecting signals: {e}")
+            logger.error("Error detecting signals: {}", e)
         
         return signals
     
@@ -78,222 +156,246 @@ class SignalDetector:
         """Detect Salesforce-specific issues"""
         signals = []
         
-        try:
-            # Check for Apex errors
-            apex_errors = await self.salesforce_client.get_apex_errors(
-                since=self.last_check_time
-            )
-            
-            for error in apex_errors:
-                signal = Signal(
-                    id=f"sf-apex-{error['Id']}",
-                    type=SignalType.ERROR,
-                    source="salesforce",
-                    component="apex",
-                    description=f"Apex error: {error.get('Message', 'Unknown error')}",
-                    severity=self._determine_severity(error),
-                    timestamp=datetime.fromisoformat(error['CreatedDate'].replace('Z', '+00:00')),
-                    metadata={
-                        "class_name": error.get('ApexClass', {}).get('Name'),
-                        "method_name": error.get('MethodName'),
-                        "line_number": error.get('Line'),
-                        "stack_trace": error.get('StackTrace')
-                    },
-                    raw_data=json.dumps(error)
-                )
-                signals.append(signal)
-            
-            # Check for Flow errors
-            flow_errors = await self.salesforce_client.get_flow_errors(
-                since=self.last_check_time
-            )
-            
-            for error in flow_errors:
-                signal = Signal(
-                    id=f"sf-flow-{error['Id']}",
-                    type=SignalType.ERROR,
-                    source="salesforce",
-                    component="flow",
-                    description=f"Flow error: {error.get('ErrorMessage', 'Unknown error')}",
-                    severity=self._determine_severity(error),
-                    timestamp=datetime.fromisoformat(error['CreatedDate'].replace('Z', '+00:00')),
-                    metadata={
-                        "flow_name": error.get('FlowVersionView', {}).get('MasterLabel'),
-                        "element_name": error.get('ElementName')
-                    },
-                    raw_data=json.dumps(error)
-                )
-                signals.append(signal)
-                
-        except Exception as e:
-            logger.error(f"Error detecting Salesforce signals: {e}")
+        # One composite request fetches Apex errors, Flow errors, deployments
+        # and test results together; the builders below are pure CPU work
+        records = await self.salesforce_client.composite_query(
+            since=self.last_check_time["salesforce"]
+        )
+        
+        builders = (
+            (self._build_apex_error_signals, records["apex_errors"], "Salesforce"),
+            (self._build_flow_error_signals, records["flow_errors"], "Salesforce"),
+            (self._build_deployment_signals, records["deployments"], "deployment"),
+            (self._build_test_failure_signals, records["test_results"], "test failure")
+        )
+        
+        # A busy org can return hundreds of rows, and turning them into signals
+        # would stall the other sources being polled alongside this one. The
+        # builders don't touch any shared state, so run them in worker threads.
+        results = await asyncio.gather(
+            *(asyncio.to_thread(build, rows) for build, rows, _ in builders),
+            return_exceptions=True
+        )
+        
+        # Every failed builder is logged, but the first failure is re-raised so
+        # detect_signals leaves the Salesforce window where it was and the
+        # rows are read again next poll
+        first_error = None
+        for (_, _, kind), result in zip(builders, results):
+            if isinstance(result, Exception):
+                logger.error("Error detecting {} signals: {}", kind, result)
+                first_error = first_error or result
+            else:
+                signals.extend(result)
+        
+        if first_error is not None:
+            raise first_error
         
         return signals
     
-    async def _detect_deployment_signals(self) -> List[Signal]:
-        """Detect deployment-related issues"""
-        signals = []
-        
-        try:
-            # Check recent deployments
-            deployments = await self.salesforce_client.get_recent_deployments(
-                since=self.last_check_time
+    def _is_reportable(self, severity: Severity) -> bool:
+        """Whether a signal of this severity clears MIN_SIGNAL_SEVERITY"""
+        return _SEVERITY_RANK[severity] >= self.min_severity_rank
+    
+    @staticmethod
+    def _make_signal(row: Dict[str, Any], *, id_prefix: str, id_key: str,
+                     ts_key: Optional[str] = None, **fields: Any) -> Signal:
+        """
+        Build a Signal from one source record.
+        The id comes from the row itself. The timestamp is parsed from the
+        row's ts_key string when one is named - sources that already hand back
+        datetimes pass timestamp= instead. Everything else is passed straight
+        through to Signal.
+        """
+        if ts_key is not None:
+            fields['timestamp'] = _parse_ts(row[ts_key])
+        return Signal(
+            id=f"{id_prefix}-{row[id_key]}",
+            raw_data=row,
+            **fields
+        )
+    
+    def _build_apex_error_signals(self, apex_errors: List[Dict[str, Any]]) -> List[Signal]:
+        """Turn ApexLog error rows into signals"""
+        return [
+            self._make_signal(
+                error, id_prefix="sf-apex", id_key="Id", ts_key="CreatedDate",
+                type=SignalType.ERROR,
+                source="salesforce",
+                component="apex",
+                description=f"Apex error: {error.get('Message', 'Unknown error')}",
+                severity=severity,
+                metadata={
+                    "class_name": error.get('ApexClass', {}).get('Name'),
+                    "method_name": error.get('MethodName'),
+                    "line_number": error.get('Line'),
+                    "stack_trace": error.get('StackTrace')
+                }
             )
-            
-            for deployment in deployments:
-                if deployment.get('Status') == 'Failed':
-                    signal = Signal(
-                        id=f"deploy-{deployment['Id']}",
-                        type=SignalType.DEPLOYMENT,
-                        source="salesforce",
-                        component="deployment",
-                        description=f"Deployment failed: {deployment.get('ErrorMessage', 'Unknown error')}",
-                        severity=Severity.HIGH,
-                        timestamp=datetime.fromisoformat(deployment['CreatedDate'].replace('Z', '+00:00')),
-                        metadata={
-                            "deployment_id": deployment['Id'],
-                            "created_by": deployment.get('CreatedBy', {}).get('Name'),
-                            "component_failures": deployment.get('ComponentFailures', [])
-                        },
-                        raw_data=json.dumps(deployment)
-                    )
-                    signals.append(signal)
-            
-            # Check GitHub deployments
-            gh_deployments = await self.github_client.get_failed_deployments(
-                since=self.last_check_time
+            for error in apex_errors
+            # Severity is decided first so rows below the threshold cost nothing more
+            if self._is_reportable(severity := self._determine_severity(error))
+        ]
+    
+    def _build_flow_error_signals(self, flow_errors: List[Dict[str, Any]]) -> List[Signal]:
+        """Turn Flow execution error rows into signals"""
+        return [
+            self._make_signal(
+                error, id_prefix="sf-flow", id_key="Id", ts_key="CreatedDate",
+                type=SignalType.ERROR,
+                source="salesforce",
+                component="flow",
+                description=f"Flow error: {error.get('ErrorMessage', 'Unknown error')}",
+                severity=severity,
+                metadata={
+                    "flow_name": error.get('FlowVersionView', {}).get('MasterLabel'),
+                    "element_name": error.get('ElementName')
+                }
             )
-            
-            for deployment in gh_deployments:
-                signal = Signal(
-                    id=f"gh-deploy-{deployment['id']}",
-                    type=SignalType.DEPLOYMENT,
-                    source="github",
-                    component="deployment",
-                    description=f"GitHub deployment failed: {deployment.get('description', 'Unknown error')}",
-                    severity=Severity.HIGH,
-                    timestamp=datetime.fromisoformat(deployment['created_at'].replace('Z', '+00:00')),
-                    metadata={
-                        "deployment_id": deployment['id'],
-                        "environment": deployment.get('environment'),
-                        "ref": deployment.get('ref'),
-                        "sha": deployment.get('sha')
-                    },
-                    raw_data=json.dumps(deployment)
-                )
-                signals.append(signal)
-                
-        except Exception as e:
-            logger.error(f"Error detecting deployment signals: {e}")
+            for error in flow_errors
+            if self._is_reportable(severity := self._determine_severity(error))
+        ]
+    
+    def _build_deployment_signals(self, deployments: List[Dict[str, Any]]) -> List[Signal]:
+        """Turn failed Salesforce deployment rows into signals"""
+        if not self._is_reportable(Severity.HIGH):
+            return []
         
-        return signals
+        return [
+            self._make_signal(
+                deployment, id_prefix="deploy", id_key="Id", ts_key="CreatedDate",
+                type=SignalType.DEPLOYMENT,
+                source="salesforce",
+                component="deployment",
+                description=f"Deployment failed: {deployment.get('ErrorMessage', 'Unknown error')}",
+                severity=Severity.HIGH,
+                metadata={
+                    "deployment_id": deployment['Id'],
+                    "created_by": deployment.get('CreatedBy', {}).get('Name'),
+                    "component_failures": deployment.get('ComponentFailures', [])
+                }
+            )
+            for deployment in deployments
+            if deployment.get('Status') == 'Failed'
+        ]
     
-    async def _detect_test_failures(self) -> List[Signal]:
-        """Detect test failures"""
-        signals = []
+    def _build_test_failure_signals(self, test_results: List[Dict[str, Any]]) -> List[Signal]:
+        """Turn failed Apex test result rows into signals"""
+        if not self._is_reportable(Severity.MEDIUM):
+            return []
         
+        return [
+            self._make_signal(
+                result, id_prefix="test", id_key="Id", ts_key="SystemModstamp",
+                type=SignalType.TEST_FAILURE,
+                source="salesforce",
+                component="apex_test",
+                description=f"Test failure: {result.get('MethodName')} - {result.get('Message', 'Unknown error')}",
+                severity=Severity.MEDIUM,
+                metadata={
+                    "test_class": result.get('ApexClass', {}).get('Name'),
+                    "test_method": result.get('MethodName'),
+                    "stack_trace": result.get('StackTrace'),
+                    "run_time": result.get('TestTimestamp')
+                }
+            )
+            for result in test_results
+            if result.get('Outcome') == 'Fail'
+        ]
+    
+    def queue_github_deployment(self, deployment: Dict[str, Any]):
+        """Queue a failed deployment reported by a GitHub webhook for the next tick"""
         try:
-            # Check Apex test failures
-            test_results = await self.salesforce_client.get_test_results(
-                since=self.last_check_time
+            self.github_events.put_nowait(deployment)
+        except asyncio.QueueFull:
+            logger.warning("GitHub event queue full - dropping deployment {}", deployment.get('id'))
+    
+    def _drain_github_events(self) -> List[Dict[str, Any]]:
+        """Take every queued webhook deployment"""
+        deployments = []
+        while not self.github_events.empty():
+            deployments.append(self.github_events.get_nowait())
+        return deployments
+    
+    async def _detect_github_deployments(self) -> List[Signal]:
+        """Detect failed GitHub deployments"""
+        if not self._is_reportable(Severity.HIGH):
+            # Nothing to report, but don't let pushed events pile up
+            self._drain_github_events()
+            return []
+        
+        if settings.GITHUB_WEBHOOKS_ENABLED:
+            # GitHub pushes these to us, so there's nothing to poll - just
+            # pick up whatever arrived since the last tick
+            gh_deployments = self._drain_github_events()
+        else:
+            gh_deployments = await self.github_client.get_failed_deployments(
+                since=self.last_check_time["github"]
             )
-            
-            for result in test_results:
-                if result.get('Outcome') == 'Fail':
-                    signal = Signal(
-                        id=f"test-{result['Id']}",
-                        type=SignalType.TEST_FAILURE,
-                        source="salesforce",
-                        component="apex_test",
-                        description=f"Test failure: {result.get('MethodName')} - {result.get('Message', 'Unknown error')}",
-                        severity=Severity.MEDIUM,
-                        timestamp=datetime.fromisoformat(result['SystemModstamp'].replace('Z', '+00:00')),
-                        metadata={
-                            "test_class": result.get('ApexClass', {}).get('Name'),
-                            "test_method": result.get('MethodName'),
-                            "stack_trace": result.get('StackTrace'),
-                            "run_time": result.get('TestTimestamp')
-                        },
-                        raw_data=json.dumps(result)
-                    )
-                    signals.append(signal)
-                    
-        except Exception as e:
-            logger.error(f"Error detecting test failure signals: {e}")
         
-        return signals
+        return [
+            self._make_signal(
+                deployment, id_prefix="gh-deploy", id_key="id", ts_key="created_at",
+                type=SignalType.DEPLOYMENT,
+                source="github",
+                component="deployment",
+                description=f"GitHub deployment failed: {deployment.get('description', 'Unknown error')}",
+                severity=Severity.HIGH,
+                metadata={
+                    "deployment_id": deployment['id'],
+                    "environment": deployment.get('environment'),
+                    "ref": deployment.get('ref'),
+                    "sha": deployment.get('sha')
+                }
+            )
+            for deployment in gh_deployments
+        ]
     
     async def _detect_monitoring_alerts(self) -> List[Signal]:
         """Detect monitoring system alerts"""
-        signals = []
+        alerts = await self.monitoring_client.get_alerts(
+            since=self.last_check_time["monitoring"]
+        )
         
-        try:
-            alerts = await self.monitoring_client.get_alerts(
-                since=self.last_check_time
+        return [
+            self._make_signal(
+                alert, id_prefix="monitoring", id_key="id",
+                timestamp=alert.get('timestamp') or datetime.now(timezone.utc),
+                type=SignalType.MONITORING_ALERT,
+                source="monitoring",
+                component=alert.get('component'),
+                description=f"Monitoring alert: {alert.get('message')}",
+                severity=severity,
+                metadata=alert.get('metadata', {})
             )
-            
-            for alert in alerts:
-                # Handle timestamp safely
-                timestamp_str = alert.get('timestamp')
-                if isinstance(timestamp_str, str):
-                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                else:
-                    timestamp = datetime.utcnow()  # Fallback to current time
-                
-                signal = Signal(
-                    id=f"monitoring-{alert['id']}",
-                    type=SignalType.MONITORING_ALERT,
-                    source="monitoring",
-                    component=alert.get('component'),
-                    description=f"Monitoring alert: {alert.get('message')}",
-                    severity=self._map_alert_severity(alert.get('severity')),
-                    timestamp=timestamp,
-                    metadata=alert.get('metadata', {}),
-                    raw_data=json.dumps(alert)
-                )
-                signals.append(signal)
-                
-        except Exception as e:
-            logger.error(f"Error detecting monitoring signals: {e}")
-        
-        return signals
+            for alert in alerts
+            if self._is_reportable(severity := self._map_alert_severity(alert.get('severity')))
+        ]
     
     async def _detect_log_anomalies(self) -> List[Signal]:
         """Detect anomalies in log patterns"""
-        signals = []
+        if not self._is_reportable(Severity.MEDIUM):
+            return []
         
-        try:
-            # This would integrate with log analysis tools
-            # For now, simulate some log anomaly detection
-            anomalies = await self.monitoring_client.detect_log_anomalies(
-                since=self.last_check_time
-            )
-            
-            for anomaly in anomalies:
-                # Handle timestamp safely
-                timestamp_str = anomaly.get('timestamp')
-                if isinstance(timestamp_str, str):
-                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                else:
-                    timestamp = datetime.utcnow()  # Fallback to current time
-                
-                signal = Signal(
-                    id=f"log-anomaly-{anomaly['id']}",
-                    type=SignalType.LOG_ANOMALY,
-                    source="logs",
-                    component=anomaly.get('component'),
-                    description=f"Log anomaly detected: {anomaly.get('description')}",
-                    severity=Severity.MEDIUM,
-                    timestamp=timestamp,
-                    metadata=anomaly.get('metadata', {}),
-                    raw_data=json.dumps(anomaly)
-                )
-                signals.append(signal)
-                
-        except Exception as e:
-            logger.error(f"Error detecting log anomaly signals: {e}")
+        # This would integrate with log analysis tools
+        # For now, simulate some log anomaly detection
+        anomalies = await self.monitoring_client.detect_log_anomalies(
+            since=self.last_check_time["logs"]
+        )
         
-        return signals
+        return [
+            self._make_signal(
+                anomaly, id_prefix="log-anomaly", id_key="id",
+                timestamp=anomaly.get('timestamp') or datetime.now(timezone.utc),
+                type=SignalType.LOG_ANOMALY,
+                source="logs",
+                component=anomaly.get('component'),
+                description=f"Log anomaly detected: {anomaly.get('description')}",
+                severity=Severity.MEDIUM,
+                metadata=anomaly.get('metadata', {})
+            )
+            for anomaly in anomalies
+        ]
     
     async def check_resolution(self, incident) -> bool:
         """Check if an incident has been resolved"""
@@ -314,7 +416,7 @@ class SignalDetector:
             return True
             
         except Exception as e:
-            logger.error(f"Error checking incident resolution: {e}")
+            logger.error("Error checking incident resolution: {}", e)
             return False
     
     async def _check_recent_errors(self, signal: Signal) -> bool:
@@ -332,23 +434,18 @@ class SignalDetector:
         # Simple severity mapping - can be enhanced with ML
         error_message = error_data.get('Message', '').lower()
         
-        if any(keyword in error_message for keyword in ['critical', 'fatal', 'system']):
-            return Severity.CRITICAL
-        elif any(keyword in error_message for keyword in ['error', 'exception', 'fail']):
-            return Severity.HIGH
-        elif any(keyword in error_message for keyword in ['warning', 'deprecated']):
-            return Severity.MEDIUM
-        else:
+        # One scan picks up every keyword; the most severe one wins
+        matches = _SEVERITY_KEYWORD_RE.findall(error_message)
+        if not matches:
             return Severity.LOW
+        return max((_SEVERITY_KEYWORDS[keyword] for keyword in matches), key=_SEVERITY_RANK.__getitem__)
     
-    def _map_alert_severity(self, alert_severity: str) -> Severity:
+    def _map_alert_severity(self, alert_severity: Optional[str]) -> Severity:
         """Map monitoring alert severity to our severity enum"""
-        mapping = {
-            'critical': Severity.CRITICAL,
-            'high': Severity.HIGH,
-            'medium': Severity.MEDIUM,
-            'low': Severity.LOW,
-            'warning': Severity.MEDIUM,
-            'error': Severity.HIGH
-        }
-        return mapping.get(alert_severity.lower(), Severity.MEDIUM)
+        if not alert_severity:
+            return Severity.MEDIUM
+        # Alerts almost always arrive lowercase already, so only lowercase on a miss
+        severity = _ALERT_SEVERITIES.get(alert_severity)
+        if severity is None:
+            severity = _ALERT_SEVERITIES.get(alert_severity.lower(), Severity.MEDIUM)
+        return severity
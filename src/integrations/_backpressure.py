@@ -0,0 +1,197 @@
+"""
+Backpressure for blocking API clients
+An AIMD concurrency limiter with a simple circuit breaker, so a struggling
+upstream API gets fewer requests instead of a storm of retries
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from loguru import logger
+
+# Errors that mean "slow down" rather than "this request was wrong"
+_OVERLOAD_STATUSES = {429, 502, 503, 504}
+_OVERLOAD_ERRORS = (ConnectionError, TimeoutError)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an API whose circuit breaker is open"""
+
+def _is_overload(exc: BaseException) -> bool:
+    """Does this exception mean the API is overloaded?"""
+    if isinstance(exc, _OVERLOAD_ERRORS):
+        return True
+    # simple_salesforce errors carry .status, jira's JIRAError .status_code
+    status = getattr(exc, "status", None) or getattr(exc, "status_code", None)
+    return status in _OVERLOAD_STATUSES
+
+class AIMDLimiter:
+    """
+    Concurrency limiter whose limit adapts to how the upstream API is coping.
+
+    Used as `async with limiter.slot():` around each call. A successful call while the
+    rolling average latency is within `target_latency` raises the limit by
+    `increase`; an overload error (429/5xx, connection reset, timeout) multiplies
+    it by `decrease`. After `failure_threshold` overload errors in a row the
+    circuit opens and calls fail fast with CircuitOpenError for `cooldown`
+    seconds, then a single trial call is let through to test the water.
+    """
+
+    __slots__ = (
+        "name", "limit", "min_limit", "max_limit", "target_latency", "increase", "decrease",
+        "failure_threshold", "cooldown", "_latencies", "_in_flight", "_condition",
+        "_consecutive_failures", "_open_until", "_trial_running"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 16,
+        target_latency: float = 2.0,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0
+    ):
+        self.name = name
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self._latencies: deque = deque(maxlen=32)
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._consecutive_failures = 0
+        self._open_until: Optional[float] = None
+        self._trial_running = False
+
+    def _admit(self) -> bool:
+        """Can another call start right now? Raises CircuitOpenError while cooling down"""
+        if self._open_until is not None:
+            if time.monotonic() < self._open_until:
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            # Half-open: once the cooldown is over, let exactly one call through
+            return not self._trial_running
+        return self._in_flight < max(int(self.limit), 1)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one unit of concurrency for the duration of an API call"""
+        async with self._condition:
+            await self._condition.wait_for(self._admit)
+            trial = self._open_until is not None
+            self._trial_running = trial
+            self._in_flight += 1
+
+        started = time.monotonic()
+        error: Optional[BaseException] = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                if trial:
+                    self._trial_running = False
+                self._record(error, time.monotonic() - started, trial)
+                self._condition.notify_all()
+
+    def _record(self, error: Optional[BaseException], latency: float, trial: bool):
+        """Adjust the limit and breaker state after a call"""
+        if error is not None and _is_overload(error):
+            self.limit = max(self.min_limit, self.limit * self.decrease)
+            self._consecutive_failures += 1
+            if trial or self._consecutive_failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.cooldown
+                logger.warning("{} circuit opened for {}s after repeated overload errors", self.name, self.cooldown)
+        elif error is None:
+            self._latencies.append(latency)
+            self._consecutive_failures = 0
+            if self._open_until is not None:
+                self._open_until = None
+                logger.info("{} circuit closed", self.name)
+            if sum(self._latencies) / len(self._latencies) <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + self.increase)
+
+class RequestBudget:
+    """
+    Client-side request budget: a sliding-window cap on requests per minute,
+    plus pauses driven by the rate-limit headers the API sends back.
+    Call `await budget.acquire()` before each request.
+    """
+
+    __slots__ = ("name", "requests_per_minute", "window", "_sent", "_paused_until")
+
+    # Start easing off once less than this fraction of the API quota is left
+    LOW_QUOTA_FRACTION = 0.10
+
+    def __init__(self, name: str, requests_per_minute: int, window: float = 60.0):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.window = window
+        self._sent: deque = deque()
+        self._paused_until = 0.0
+
+    async def acquire(self):
+        """Wait until another request fits in the budget, then claim it"""
+        while True:
+            now = time.monotonic()
+            while self._sent and self._sent[0] <= now - self.window:
+                self._sent.popleft()
+
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+            elif len(self._sent) >= self.requests_per_minute:
+                await asyncio.sleep(self._sent[0] + self.window - now)
+            else:
+                self._sent.append(now)
+                return
+
+    def pause(self, seconds: float):
+        """Hold back every request for the next `seconds`"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe_usage(self, used: int, limit: int, retry_after: Optional[float] = None):
+        """Record quota usage reported by the API, pausing if it's running low"""
+        if limit and (limit - used) / limit < self.LOW_QUOTA_FRACTION:
+            logger.warning("{} API quota low ({}/{}) - throttling requests", self.name, used, limit)
+            self.pause(retry_after or 1.0)
+
+class TokenBucket:
+    """
+    Token bucket rate limiter: bursts of up to `capacity` calls, refilled at
+    `rate` calls per second. `await bucket.acquire()` waits for a token.
+    """
+
+    __slots__ = ("rate", "capacity", "_tokens", "_updated", "_lock")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Take one token, waiting for the bucket to refill if it's empty"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,72 @@
+"""
+Async TTL cache
+A small in-process cache for the results of coroutine calls, used to avoid
+fetching the same data from an external API several times in a row
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class AsyncTTLCache:
+    """
+    Least-recently-used cache whose entries expire after `ttl` seconds.
+
+    Concurrent misses on the same key are coalesced: the first caller runs the
+    fetch and everyone else waits for its result, so an expired entry doesn't
+    send a burst of identical requests upstream. Failed fetches aren't cached.
+    """
+
+    __slots__ = ("maxsize", "ttl", "_entries", "_in_flight")
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Event] = {}
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """(True, value) for a live entry, (False, None) otherwise"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, calling `fetch()` to fill it on a miss"""
+        while True:
+            found, value = self._lookup(key)
+            if found:
+                return value
+
+            pending = self._in_flight.get(key)
+            if pending is None:
+                break
+            # Someone else is already fetching this - wait, then look again
+            # (if their fetch failed, one of the waiters takes over)
+            await pending.wait()
+
+        done = asyncio.Event()
+        self._in_flight[key] = done
+        try:
+            value = await fetch()
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return value
+        finally:
+            del self._in_flight[key]
+            done.set()
+
+    def clear(self):
+        """Drop every cached entry"""
+        self._entries.clear()
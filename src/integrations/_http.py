@@ -0,0 +1,79 @@
+"""
+Shared HTTP session
+One pooled aiohttp session for all the integration clients, so they share
+keep-alive connections and DNS lookups instead of each opening their own
+"""
+
+import asyncio
+import importlib.util
+import socket
+import weakref
+
+import aiohttp
+import orjson
+
+# aiohttp's AsyncResolver needs the optional aiodns package; without it the
+# connector falls back to resolving hostnames in a thread
+HAS_AIODNS = importlib.util.find_spec("aiodns") is not None
+
+# For the Slack client's httpx transport: send small requests immediately
+# instead of letting Nagle's algorithm hold them back waiting for an ACK.
+# asyncio already sets this on the sockets it creates; stating it here keeps
+# it true whatever backend httpcore ends up on. aiohttp sets it on its own.
+# The send buffer is left to the kernel - a fixed SO_SNDBUF turns off Linux's
+# buffer autotuning
+HTTPX_SOCKET_OPTIONS = ((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),)
+
+# aiohttp sessions belong to the event loop they were made on, so keep one per loop
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared session for the running event loop, creating it on first use.
+    Clients must not close it themselves - close_session() does that at shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+
+    # There's no await between the check and the store, so two callers can't
+    # both end up creating a session - no lock needed
+    if session is None or session.closed:
+        session = create_session()
+        _sessions[loop] = session
+
+    return session
+
+def _dumps(obj) -> str:
+    """
+    JSON encoder for request bodies passed as json=... (the GitHub client).
+    Non-string keys are allowed, matching what json.dumps accepted
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Build a pooled session for the running event loop: keep-alive connections,
+    DNS answers cached for 5 minutes, and async DNS lookups when aiodns is installed
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=512,
+            limit_per_host=64,
+            keepalive_timeout=30,
+            ttl_dns_cache=300,
+            resolver=aiohttp.AsyncResolver() if HAS_AIODNS else None,
+            enable_cleanup_closed=True
+        ),
+        timeout=aiohttp.ClientTimeout(total=30),
+        json_serialize=_dumps
+    )
+
+def set_session(session: aiohttp.ClientSession):
+    """Install `session` as the running loop's shared session (done once at app startup)"""
+    _sessions[asyncio.get_running_loop()] = session
+
+async def close_session():
+    """Close the running loop's shared session, if one was ever created"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
@@ -4,193 +4,420 @@ Handles GitHub API interactions for repository monitoring
 """
 
 import asyncio
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
 from loguru import logger
 import aiohttp
+import orjson
 
 from ..core.config import settings
+from ._http import get_session
 
-# Optional import - works without this package installed
-try:
-    from github import Github
-    HAS_GITHUB = True
-except ImportError:
-    logger.warning("PyGithub not installed - GitHub integration disabled")
-    Github = None
-    HAS_GITHUB = False
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+
+# How many conditional-GET responses to remember (oldest are dropped first)
+_ETAG_CACHE_SIZE = 256
+
+# At most this many requests in flight at once - bursts beyond that trip
+# GitHub's secondary rate limits and earn a long Retry-After
+_MAX_CONCURRENT_REQUESTS = 10
+
+# Once fewer than this many requests are left in the rate-limit window,
+# hold off until the window resets instead of running it down to zero
+_RATE_LIMIT_FLOOR = 20
+
+# Reads are retried this many times on transient failures, waiting
+# _RETRY_BACKOFF, then twice that, and so on between attempts
+_MAX_RETRIES = 3
+_RETRY_BACKOFF = 0.3
+
+# Deployments and their statuses in one round trip, newest first. The REST API
+# needs a separate statuses request per deployment for the same information.
+_FAILED_DEPLOYMENTS_QUERY = """
+query($owner: String!, $name: String!, $environments: [String!], $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    deployments(first: 100, after: $cursor, environments: $environments,
+                orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        description
+        environment
+        createdAt
+        ref { name }
+        commit { oid }
+        statuses(first: 20) { nodes { state } }
+      }
+    }
+  }
+}
+"""
+
+# Most commits to look up in one GraphQL query
+_PR_LOOKUP_BATCH_SIZE = 50
+
+def _prs_for_commits_query(count: int) -> str:
+    """
+    GraphQL query for the pull requests of `count` commits at once.
+    Each commit is an aliased field (c0, c1, ...) with its SHA passed as the
+    matching $c0, $c1, ... variable, so SHAs never get spliced into the query.
+    """
+    variables = ''.join(f', $c{i}: GitObjectID!' for i in range(count))
+    commits = ''.join(
+        f"""
+    c{i}: object(oid: $c{i}) {{
+      ... on Commit {{
+        associatedPullRequests(first: 5) {{
+          nodes {{ number title state url headRefOid baseRefName }}
+        }}
+      }}
+    }}"""
+        for i in range(count)
+    )
+    return f"""
+query($owner: String!, $name: String!{variables}) {{
+  repository(owner: $owner, name: $name) {{{commits}
+  }}
+}}
+"""
 
 class GitHubClient:
     """Client for GitHub API interactions"""
     
     def __init__(self):
-        self.github = None
-        self.repo = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._headers: Dict[str, str] = {}
+        self.repo: Optional[str] = None  # "owner/name"
+        # URL -> (ETag, decoded body) of the last 200 we got for it
+        self._etag_cache: Dict[str, Tuple[str, Any]] = {}
+        self._semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+        self._rate_limit_reset = 0.0  # epoch seconds to wait for, 0 when not throttled
         
     async def initialize(self):
         """Initialize GitHub connection"""
         try:
-            if not HAS_GITHUB:
-                logger.warning("PyGithub not available - using mock data")
-                return
-                
             if not settings.GITHUB_TOKEN:
                 logger.warning("GitHub token not configured - using mock data")
                 return
-                
-            # self.github = Github(settings.GITHUB_TOKEN)
-            # You would configure the specific repository here
-            # self.repo = self.github.get_repo("your-org/your-repo")
-            logger.info("GitHub integration disabled - using mock responses")
+            
+            if not settings.GITHUB_REPO:
+                logger.warning("GitHub repository not configured - using mock data")
+                return
+            
+            # The pooled session is shared with the other clients, so our auth
+            # goes on each request rather than on the session
+            self.session = await get_session()
+            self._headers = {
+                'Authorization': f'token {settings.GITHUB_TOKEN}',
+                'Accept': 'application/vnd.github+json'
+            }
+            self.repo = settings.GITHUB_REPO
             
             logger.info("GitHub client initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize GitHub client: {e}")
+            logger.error("Failed to initialize GitHub client: {}", e)
     
     async def cleanup(self):
         """Cleanup resources"""
-        pass
+        # The shared session is closed once at application shutdown
+        self.session = None
+    
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Hold one of the concurrent request slots, waiting out the rate limit first if it's nearly spent"""
+        async with self._semaphore:
+            delay = self._rate_limit_reset - time.time()
+            if delay > 0:
+                logger.warning("GitHub rate limit nearly used up - waiting {:.0f}s for it to reset", delay)
+                await asyncio.sleep(delay)
+            yield
+    
+    def _track_rate_limit(self, response: aiohttp.ClientResponse):
+        """Remember when to back off, based on the rate-limit headers of a response"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None and int(remaining) < _RATE_LIMIT_FLOOR:
+            self._rate_limit_reset = float(response.headers.get('X-RateLimit-Reset', 0))
+    
+    async def _send(self, method: str, url: str, retries: int = 0, **kwargs) -> Tuple[int, Any, Any]:
+        """
+        Send one request and return (status, headers, decoded body) - a 304 has no body.
+        Reads pass `retries` so dropped connections, timeouts and 5xx answers are
+        retried with exponential backoff. Writes don't, so that a comment or issue
+        never gets created twice.
+        """
+        kwargs['headers'] = {**self._headers, **(kwargs.get('headers') or {})}
+        
+        for attempt in range(retries + 1):
+            try:
+                async with self._request_slot(), self.session.request(method, url, **kwargs) as response:
+                    self._track_rate_limit(response)
+                    if response.status == 304:
+                        return response.status, response.headers, None
+                    response.raise_for_status()
+                    # orjson decodes the (sometimes large) list and GraphQL payloads
+                    # several times faster than the stdlib json aiohttp uses by default
+                    return response.status, response.headers, await response.json(loads=orjson.loads)
+                    
+            except (aiohttp.ClientConnectionError, aiohttp.ClientResponseError, asyncio.TimeoutError) as e:
+                transient = not isinstance(e, aiohttp.ClientResponseError) or e.status >= 500
+                if not transient or attempt == retries:
+                    raise
+                await asyncio.sleep(_RETRY_BACKOFF * 2 ** attempt)
+    
+    async def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a GraphQL query and return its data, raising on any errors"""
+        _, _, payload = await self._send(
+            'POST', GITHUB_GRAPHQL_URL, retries=_MAX_RETRIES,
+            json={'query': query, 'variables': variables}
+        )
+        
+        if payload.get('errors'):
+            raise RuntimeError(f"GitHub GraphQL error: {payload['errors'][0].get('message')}")
+        return payload['data']
+    
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Conditional GET against the configured repository.
+        
+        GitHub answers If-None-Match with an empty 304 (which doesn't count
+        against the rate limit) when nothing changed, and then we hand back
+        what we decoded last time instead of downloading and parsing it again.
+        ETags are hashes of the body, so entries are keyed by path alone - a
+        poll with a newer `since` still gets a 304 if the result is the same.
+        """
+        url = f"{GITHUB_API_URL}/repos/{self.repo}{path}"
+        cached = self._etag_cache.get(url)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        
+        status, response_headers, data = await self._send(
+            'GET', url, retries=_MAX_RETRIES, params=params, headers=headers
+        )
+        if status == 304:
+            return cached[1]
+        
+        etag = response_headers.get('ETag')
+        if etag:
+            if url not in self._etag_cache and len(self._etag_cache) >= _ETAG_CACHE_SIZE:
+                self._etag_cache.pop(next(iter(self._etag_cache)))
+            self._etag_cache[url] = (etag, data)
+        return data
+    
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Any:
+        """POST to the configured repository and return the decoded JSON"""
+        _, _, data = await self._send('POST', f"{GITHUB_API_URL}/repos/{self.repo}{path}", json=payload)
+        return data
     
     async def get_failed_deployments(self, since: datetime) -> List[Dict[str, Any]]:
-        """Get failed deployments since specified time"""
+        """
+        Get failed deployments since specified time.
+        Mock data is returned only when GitHub isn't configured; a failed fetch
+        raises, so the detector doesn't move its window past deployments it missed
+        """
+        if not self.session or not self.repo:
+            return self._mock_failed_deployments()
+        
         try:
-            if not self.github or not self.repo:
-                return self._mock_failed_deployments()
-            
-            deployments = self.repo.get_deployments()
+            owner, name = self.repo.split('/', 1)
+            variables = {
+                'owner': owner,
+                'name': name,
+                # Narrow the listing server-side when we only care about one environment
+                'environments': [settings.GITHUB_DEPLOYMENT_ENVIRONMENT] if settings.GITHUB_DEPLOYMENT_ENVIRONMENT else None,
+                'cursor': None
+            }
+            since_iso = since.strftime('%Y-%m-%dT%H:%M:%SZ')
             failed_deployments = []
             
-            for deployment in deployments:
-                if deployment.created_at >= since:
-                    statuses = deployment.get_statuses()
-                    for status in statuses:
-                        if status.state == 'failure':
-                            failed_deployments.append({
-                                'id': deployment.id,
-                                'description': deployment.description,
-                                'environment': deployment.environment,
-                                'ref': deployment.ref,
-                                'sha': deployment.sha,
-                                'created_at': deployment.created_at.isoformat(),
-                                'status': status.state
-                            })
-                            break
-            
-            return failed_deployments
+            while True:
+                data = await self._graphql(_FAILED_DEPLOYMENTS_QUERY, variables)
+                deployments = data['repository']['deployments']
+                
+                for deployment in deployments['nodes']:
+                    # Deployments come back newest first, so once we're past the
+                    # window nothing further can match - stop paging
+                    if deployment['createdAt'] < since_iso:
+                        return failed_deployments
+                    
+                    if any(status['state'] == 'FAILURE' for status in deployment['statuses']['nodes']):
+                        failed_deployments.append({
+                            'id': deployment['databaseId'],
+                            'description': deployment['description'],
+                            'environment': deployment['environment'],
+                            'ref': deployment['ref']['name'] if deployment['ref'] else deployment['commit']['oid'],
+                            'sha': deployment['commit']['oid'],
+                            'created_at': deployment['createdAt'],
+                            'status': 'failure'
+                        })
+                
+                if not deployments['pageInfo']['hasNextPage']:
+                    return failed_deployments
+                variables['cursor'] = deployments['pageInfo']['endCursor']
             
         except Exception as e:
-            logger.error(f"Error fetching GitHub deployments: {e}")
-            return self._mock_failed_deployments()
+            logger.error("Error fetching GitHub deployments: {}", e)
+            raise
     
     async def get_recent_commits(self, since: datetime) -> List[Dict[str, Any]]:
         """Get recent commits since specified time"""
         try:
-            if not self.github or not self.repo:
+            if not self.session or not self.repo:
                 return self._mock_recent_commits()
             
-            commits = self.repo.get_commits(since=since)
-            commit_list = []
+            # GraphQL doesn't expose the changed files of a commit, so this stays
+            # on REST: list the commits, then fetch their details side by side
+            summaries = await self._get(
+                '/commits',
+                params={'since': since.strftime('%Y-%m-%dT%H:%M:%SZ'), 'per_page': 100}
+            )
+            details = await asyncio.gather(
+                *(self._get(f"/commits/{summary['sha']}") for summary in summaries)
+            )
             
-            for commit in commits:
-                commit_list.append({
-                    'sha': commit.sha,
-                    'message': commit.commit.message,
+            return [
+                {
+                    'sha': commit['sha'],
+                    'message': commit['commit']['message'],
                     'author': {
-                        'name': commit.commit.author.name,
-                        'email': commit.commit.author.email
+                        'name': commit['commit']['author']['name'],
+                        'email': commit['commit']['author']['email']
                     },
-                    'timestamp': commit.commit.author.date.isoformat(),
+                    'timestamp': commit['commit']['author']['date'],
                     'files': [
                         {
-                            'filename': file.filename,
-                            'status': file.status,
-                            'additions': file.additions,
-                            'deletions': file.deletions
+                            'filename': file['filename'],
+                            'status': file['status'],
+                            'additions': file['additions'],
+                            'deletions': file['deletions']
                         }
-                        for file in commit.files
-                    ] if commit.files else []
-                })
-            
-            return commit_list
+                        for file in commit.get('files') or []
+                    ]
+                }
+                for commit in details
+            ]
             
         except Exception as e:
-            logger.error(f"Error fetching GitHub commits: {e}")
+            logger.error("Error fetching GitHub commits: {}", e)
             return self._mock_recent_commits()
     
     async def find_prs_for_commits(self, commit_shas: List[str]) -> List[Dict[str, Any]]:
         """Find pull requests that contain the specified commits"""
         try:
-            if not self.github or not self.repo:
+            if not self.session or not self.repo:
                 return self._mock_prs()
             
+            owner, name = self.repo.split('/', 1)
+            
+            # Every commit goes into one aliased GraphQL query (c0, c1, ...), so
+            # a batch of N SHAs is one round trip instead of N REST calls. Very
+            # large batches are split so a single query stays a sensible size.
+            batches = [
+                commit_shas[start:start + _PR_LOOKUP_BATCH_SIZE]
+                for start in range(0, len(commit_shas), _PR_LOOKUP_BATCH_SIZE)
+            ]
+            results = await asyncio.gather(
+                *(self._graphql(_prs_for_commits_query(len(batch)),
+                                {'owner': owner, 'name': name,
+                                 **{f'c{i}': sha for i, sha in enumerate(batch)}})
+                  for batch in batches)
+            )
+            
             prs = []
-            for sha in commit_shas:
-                try:
-                    commit = self.repo.get_commit(sha)
-                    pulls = commit.get_pulls()
+            for batch, data in zip(batches, results):
+                repository = data['repository']
+                for i in range(len(batch)):
+                    # Unknown SHAs come back as null
+                    commit = repository[f'c{i}']
+                    if not commit:
+                        continue
                     
-                    for pr in pulls:
-                        prs.append({
-                            'number': pr.number,
-                            'title': pr.title,
-                            'state': pr.state,
-                            'html_url': pr.html_url,
-                            'head_sha': pr.head.sha,
-                            'base_ref': pr.base.ref
-                        })
-                except Exception as e:
-                    logger.error(f"Error finding PRs for commit {sha}: {e}")
+                    prs.extend(
+                        {
+                            'number': pr['number'],
+                            'title': pr['title'],
+                            # REST reports merged pull requests as closed
+                            'state': 'open' if pr['state'] == 'OPEN' else 'closed',
+                            'html_url': pr['url'],
+                            'head_sha': pr['headRefOid'],
+                            'base_ref': pr['baseRefName']
+                        }
+                        for pr in commit['associatedPullRequests']['nodes']
+                    )
             
             return prs
             
         except Exception as e:
-            logger.error(f"Error finding PRs for commits: {e}")
+            logger.error("Error finding PRs for commits: {}", e)
             return self._mock_prs()
     
     async def create_pr_comment(self, pr_number: int, comment_body: str) -> Dict[str, Any]:
         """Create a comment on a pull request"""
         try:
-            if not self.github or not self.repo:
+            if not self.session or not self.repo:
                 return self._mock_pr_comment()
             
-            pr = self.repo.get_pull(pr_number)
-            comment = pr.create_issue_comment(comment_body)
+            # PR conversation comments live on the issues endpoint
+            comment = await self._post(f"/issues/{pr_number}/comments", {'body': comment_body})
             
             return {
-                'id': comment.id,
-                'html_url': comment.html_url,
-                'created_at': comment.created_at.isoformat()
+                'id': comment['id'],
+                'html_url': comment['html_url'],
+                'created_at': comment['created_at']
             }
             
         except Exception as e:
-            logger.error(f"Error creating PR comment: {e}")
+            logger.error("Error creating PR comment: {}", e)
             return self._mock_pr_comment()
     
     async def create_issue(self, issue_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a GitHub issue"""
         try:
-            if not self.github or not self.repo:
+            if not self.session or not self.repo:
                 return self._mock_issue()
             
-            issue = self.repo.create_issue(
-                title=issue_data['title'],
-                body=issue_data['body'],
-                labels=issue_data.get('labels', [])
-            )
+            issue = await self._post('/issues', {
+                'title': issue_data['title'],
+                'body': issue_data['body'],
+                'labels': issue_data.get('labels', [])
+            })
             
             return {
-                'number': issue.number,
-                'html_url': issue.html_url,
-                'created_at': issue.created_at.isoformat()
+                'number': issue['number'],
+                'html_url': issue['html_url'],
+                'created_at': issue['created_at']
             }
             
         except Exception as e:
-            logger.error(f"Error creating GitHub issue: {e}")
+            logger.error("Error creating GitHub issue: {}", e)
             return self._mock_issue()
     
+    @staticmethod
+    def failed_deployment_from_event(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Turn a deployment_status webhook payload into the same shape
+        get_failed_deployments returns, or None if the deployment didn't fail
+        """
+        status = payload.get('deployment_status') or {}
+        if status.get('state') != 'failure':
+            return None
+        
+        deployment = payload['deployment']
+        return {
+            'id': deployment['id'],
+            'description': deployment.get('description'),
+            'environment': deployment.get('environment'),
+            'ref': deployment.get('ref'),
+            'sha': deployment.get('sha'),
+            'created_at': deployment['created_at'],
+            'status': status['state']
+        }
+    
     def _mock_failed_deployments(self) -> List[Dict[str, Any]]:
         """Mock failed deployments for demo purposes"""
+        now = time.time()
         return [
             {
                 'id': 12345,
@@ -198,13 +425,14 @@ class GitHubClient:
                 'environment': 'production',
                 'ref': 'main',
                 'sha': 'abc123def456',
-                'created_at': (datetime.utcnow() - timedelta(minutes=25)).isoformat(),
+                'created_at': datetime.fromtimestamp(now - 1500, tz=timezone.utc).isoformat(),
                 'status': 'failure'
             }
         ]
     
     def _mock_recent_commits(self) -> List[Dict[str, Any]]:
         """Mock recent commits for demo purposes"""
+        now = time.time()
         return [
             {
                 'sha': 'abc123def456',
@@ -213,7 +441,7 @@ class GitHubClient:
                     'name': 'John Developer',
                     'email': 'john@company.com'
                 },
-                'timestamp': (datetime.utcnow() - timedelta(minutes=35)).isoformat(),
+                'timestamp': datetime.fromtimestamp(now - 2100, tz=timezone.utc).isoformat(),
                 'files': [
                     {
                         'filename': 'force-app/main/default/triggers/AccountTrigger.trigger',
@@ -236,7 +464,7 @@ class GitHubClient:
                     'name': 'Jane Developer',
                     'email': 'jane@company.com'
                 },
-                'timestamp': (datetime.utcnow() - timedelta(hours=2)).isoformat(),
+                'timestamp': datetime.fromtimestamp(now - 7200, tz=timezone.utc).isoformat(),
                 'files': [
                     {
                         'filename': 'force-app/main/default/classes/OpportunityService.cls',
@@ -266,7 +494,7 @@ class GitHubClient:
         return {
             'id': 987654321,
             'html_url': 'https://github.com/company/salesforce-repo/pull/42#issuecomment-987654321',
-            'created_at': datetime.utcnow().isoformat()
+            'created_at': datetime.now(timezone.utc).isoformat()
         }
     
     def _mock_issue(self) -> Dict[str, Any]:
@@ -274,5 +502,5 @@ class GitHubClient:
         return {
             'number': 123,
             'html_url': 'https://github.com/company/salesforce-repo/issues/123',
-            'created_at': datetime.utcnow().isoformat()
+            'created_at': datetime.now(timezone.utc).isoformat()
         }
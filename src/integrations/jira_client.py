@@ -4,12 +4,18 @@ Handles Jira API interactions for ticket management
 """
 
 import asyncio
-from datetime import datetime
-from typing import Dict, Any, Optional
+import functools
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 from loguru import logger
-import aiohttp
 
 from ..core.config import settings
+from ._backpressure import AIMDLimiter, RequestBudget
+from ._threads import run_blocking
+
+# Governs concurrent calls to the Jira API across all clients
+_JIRA_LIMITER = AIMDLimiter("Jira")
+_JIRA_BUDGET = RequestBudget("Jira", requests_per_minute=60)
 
 # Optional import - works without this package installed
 try:
@@ -25,6 +31,18 @@ class JiraClient:
     
     def __init__(self):
         self.jira = None
+        # The mock response never changes, so build it once - read-only, so
+        # one caller can't alter what the next one gets
+        self._mock_issue = MappingProxyType({
+            'key': 'OBS-123',
+            'id': '10001',
+            'url': f"{self._base_url}/browse/OBS-123"
+        })
+    
+    @functools.cached_property
+    def _base_url(self) -> str:
+        """Jira site URL, or the demo default when none is configured"""
+        return settings.JIRA_SERVER or 'https://company.atlassian.net'
         
     async def initialize(self):
         """Initialize Jira connection"""
@@ -43,22 +61,30 @@ class JiraClient:
             # )
             logger.info("Jira integration disabled - using mock responses")
             
+            # Rate-limit tracking hooks into the JIRA client's requests session, so
+            # it only takes effect once the client above is actually constructed;
+            # while it stays commented out, self.jira is None and this is skipped
+            if self.jira:
+                self.jira._session.hooks["response"].append(self._track_rate_limit)
+            
             logger.info("Jira client initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize Jira client: {e}")
+            logger.error("Failed to initialize Jira client: {}", e)
     
     async def cleanup(self):
         """Cleanup resources"""
         pass
     
-    async def create_issue(self, issue_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_issue(self, issue_data: Dict[str, Any]) -> Mapping[str, Any]:
         """Create a Jira issue"""
         try:
             if not self.jira:
                 return self._mock_issue_creation()
             
-            issue = self.jira.create_issue(fields=issue_data)
+            await _JIRA_BUDGET.acquire()
+            async with _JIRA_LIMITER.slot():
+                issue = await run_blocking(self.jira.create_issue, fields=issue_data)
             
             return {
                 'key': issue.key,
@@ -67,137 +93,25 @@ class JiraClient:
             }
             
         except Exception as e:
-            logger.error(f"Error creating Jira issue: {e}")
+            logger.error("Error creating Jira issue: {}", e)
             return self._mock_issue_creation()
     
-    def _mock_issue_creation(self) -> Dict[str, Any]:
-        """Mock issue creation for demo purposes"""
-        return {
-            'key': 'OBS-123',
-            'id': '10001',
-            'url': f"{settings.JIRA_SERVER or 'https://company.atlassian.net'}/browse/OBS-123"
-        }
-
-class SlackClient:
-    """Client for Slack API interactions"""
-    
-    def __init__(self):
-        self.session = None
-        
-    async def initialize(self):
-        """Initialize Slack client"""
+    def _track_rate_limit(self, response, *args, **kwargs):
+        """
+        requests response hook - feed Jira's X-RateLimit-* and Retry-After headers
+        into the budget. Installed by initialize() only when a real JIRA client exists
+        """
+        headers = response.headers
         try:
-            if not settings.SLACK_WEBHOOK_URL:
-                logger.warning("Slack webhook not configured - using mock responses")
-                return
-                
-            self.session = aiohttp.ClientSession()
-            logger.info("Slack client initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize Slack client: {e}")
-    
-    async def cleanup(self):
-        """Cleanup resources"""
-        if self.session:
-            await self.session.close()
+            retry_after = float(headers["Retry-After"]) if "Retry-After" in headers else None
+            if response.status_code == 429:
+                _JIRA_BUDGET.pause(retry_after or 1.0)
+            elif "X-RateLimit-Limit" in headers and "X-RateLimit-Remaining" in headers:
+                limit = int(headers["X-RateLimit-Limit"])
+                _JIRA_BUDGET.observe_usage(limit - int(headers["X-RateLimit-Remaining"]), limit, retry_after)
+        except ValueError:
+            logger.opt(lazy=True).debug("Unparseable Jira rate-limit headers: {}", lambda: dict(headers))
     
-    async def send_message(self, channel: str, message: Dict[str, Any], priority: str = "normal") -> Dict[str, Any]:
-        """Send a message to Slack"""
-        try:
-            if not self.session or not settings.SLACK_WEBHOOK_URL:
-                return self._mock_message_send()
-            
-            payload = {
-                "channel": channel,
-                **message
-            }
-            
-            async with self.session.post(settings.SLACK_WEBHOOK_URL, json=payload) as response:
-                if response.status == 200:
-                    return {
-                        "ts": str(datetime.utcnow().timestamp()),
-                        "channel": channel
-                    }
-                else:
-                    logger.error(f"Slack API error: {response.status}")
-                    return self._mock_message_send()
-                    
-        except Exception as e:
-            logger.error(f"Error sending Slack message: {e}")
-            return self._mock_message_send()
-    
-    def _mock_message_send(self) -> Dict[str, Any]:
-        """Mock message send for demo purposes"""
-        return {
-            "ts": str(datetime.utcnow().timestamp()),
-            "channel": "#alerts"
-        }
-
-class MonitoringClient:
-    """Client for monitoring system interactions"""
-    
-    def __init__(self):
-        self.session = None
-        
-    async def initialize(self):
-        """Initialize monitoring client"""
-        try:
-            self.session = aiohttp.ClientSession()
-            logger.info("Monitoring client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize monitoring client: {e}")
-    
-    async def cleanup(self):
-        """Cleanup resources"""
-        if self.session:
-            await self.session.close()
-    
-    async def get_alerts(self, since: datetime) -> list:
-        """Get monitoring alerts since specified time"""
-        try:
-            # This would integrate with your monitoring system (Datadog, New Relic, etc.)
-            return self._mock_alerts()
-        except Exception as e:
-            logger.error(f"Error fetching monitoring alerts: {e}")
-            return []
-    
-    async def detect_log_anomalies(self, since: datetime) -> list:
-        """Detect log anomalies since specified time"""
-        try:
-            # This would integrate with log analysis tools
-            return self._mock_log_anomalies()
-        except Exception as e:
-            logger.error(f"Error detecting log anomalies: {e}")
-            return []
-    
-    def _mock_alerts(self) -> list:
-        """Mock monitoring alerts for demo purposes"""
-        return [
-            {
-                'id': 'alert_001',
-                'message': 'High CPU usage detected on Salesforce org',
-                'severity': 'high',
-                'component': 'salesforce_org',
-                'timestamp': (datetime.utcnow() - timedelta(minutes=10)).isoformat(),
-                'metadata': {
-                    'cpu_usage': '85%',
-                    'threshold': '80%'
-                }
-            }
-        ]
-    
-    def _mock_log_anomalies(self) -> list:
-        """Mock log anomalies for demo purposes"""
-        return [
-            {
-                'id': 'anomaly_001',
-                'description': 'Unusual spike in API errors',
-                'component': 'api_gateway',
-                'timestamp': (datetime.utcnow() - timedelta(minutes=5)).isoformat(),
-                'metadata': {
-                    'error_rate': '15%',
-                    'normal_rate': '2%'
-                }
-            }
-        ]
+    def _mock_issue_creation(self) -> Mapping[str, Any]:
+        """Mock issue creation for demo purposes"""
+        return self._mock_issue
@@ -4,11 +4,51 @@ Collects and reports on system status, performance indicators, and health checks
 """
 
 import asyncio
+import functools
+import importlib.util
 import psutil
 import time
+from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from loguru import logger
 from ..core.config import settings
+from ._threads import run_blocking
+
+# Installed packages don't change at runtime, so look them up once.
+# find_spec only locates the package - it doesn't run its import
+_DEPENDENCIES = {
+    name: importlib.util.find_spec(name) is not None
+    for name in ("fastapi", "uvicorn", "simple_salesforce", "aiohttp", "jira", "openai")
+}
+
+# How often the background task samples CPU usage
+_CPU_SAMPLE_INTERVAL = 2.0
+
+def _ttl_cached(ttl: float):
+    """Cache a no-argument function's result for `ttl` seconds"""
+    def decorator(func):
+        cached = None
+        expires_at = 0.0
+
+        @functools.wraps(func)
+        def wrapper():
+            nonlocal cached, expires_at
+            now = time.monotonic()
+            if now >= expires_at:
+                cached = func()
+                expires_at = now + ttl
+            return cached
+        return wrapper
+    return decorator
+
+# Disk totals and network counters barely move between health checks
+@_ttl_cached(5.0)
+def _disk_usage():
+    return psutil.disk_usage('/')
+
+@_ttl_cached(5.0)
+def _net_io_counters():
+    return psutil.net_io_counters()
 
 class MonitoringClient:
     """
@@ -18,28 +58,50 @@ class MonitoringClient:
     def __init__(self):
         """Initialize the monitoring client"""
         self.start_time = time.time()
+        self._cpu = 0.0
+        self._cpu_task: Optional[asyncio.Task] = None
         logger.info("Monitoring client initialized")
         
     async def initialize(self):
         """Initialize the monitoring client (async setup if needed)"""
+        self._start_cpu_sampler()
         logger.info("Monitoring client initialization complete")
         return True
+
+    def _start_cpu_sampler(self):
+        """Start the background CPU sampler if it isn't running yet"""
+        if self._cpu_task is None or self._cpu_task.done():
+            self._cpu_task = asyncio.create_task(self._cpu_sampler())
+
+    async def _cpu_sampler(self):
+        """
+        Keep self._cpu up to date. cpu_percent(interval=None) measures usage since
+        the previous call, so sampling here means health checks never have to
+        block for a measurement window
+        """
+        psutil.cpu_percent(interval=None)
+        while True:
+            await asyncio.sleep(_CPU_SAMPLE_INTERVAL)
+            self._cpu = psutil.cpu_percent(interval=None)
         
     async def get_system_health(self) -> Dict[str, Any]:
         """
         Get comprehensive system health metrics
         """
         try:
-            # CPU and Memory metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
-            # Network metrics
-            network = psutil.net_io_counters()
+            # CPU comes from the background sampler, the rest runs on the
+            # bounded integration pool rather than the loop's default executor
+            self._start_cpu_sampler()
+            cpu_percent = self._cpu
+            memory, disk, network = await asyncio.gather(
+                run_blocking(psutil.virtual_memory),
+                run_blocking(_disk_usage),
+                run_blocking(_net_io_counters)
+            )
             
             # Application uptime
-            uptime = time.time() - self.start_time
+            now = time.time()
+            uptime = now - self.start_time
             
             health_data = {
                 "status": "healthy" if cpu_percent < 80 and memory.percent < 85 else "warning",
@@ -63,13 +125,13 @@ class MonitoringClient:
                     "packets_sent": network.packets_sent,
                     "packets_recv": network.packets_recv
                 },
-                "timestamp": time.time()
+                "timestamp": now
             }
             
             return health_data
             
         except Exception as e:
-            logger.error(f"Error collecting system health metrics: {e}")
+            logger.error("Error collecting system health metrics: {}", e)
             return {
                 "status": "error",
                 "error": str(e),
@@ -81,9 +143,10 @@ class MonitoringClient:
         Get application-specific metrics and performance data
         """
         try:
+            now = time.time()
             metrics = {
                 "app_status": "running",
-                "uptime_seconds": round(time.time() - self.start_time, 2),
+                "uptime_seconds": round(now - self.start_time, 2),
                 "debug_mode": settings.DEBUG,
                 "log_level": settings.LOG_LEVEL,
                 "integrations": {
@@ -93,13 +156,13 @@ class MonitoringClient:
                     "openai": bool(settings.OPENAI_API_KEY),
                     "slack": bool(settings.SLACK_BOT_TOKEN)
                 },
-                "timestamp": time.time()
+                "timestamp": now
             }
             
             return metrics
             
         except Exception as e:
-            logger.error(f"Error collecting application metrics: {e}")
+            logger.error("Error collecting application metrics: {}", e)
             return {
                 "status": "error",
                 "error": str(e),
@@ -110,126 +173,104 @@ class MonitoringClient:
         """
         Check if all required dependencies and integrations are available
         """
-        dependencies = {}
-        
-        # Check core dependencies
-        try:
-            import fastapi
-            dependencies["fastapi"] = True
-        except ImportError:
-            dependencies["fastapi"] = False
-            
-        try:
-            import uvicorn
-            dependencies["uvicorn"] = True
-        except ImportError:
-            dependencies["uvicorn"] = False
-            
-        # Check integration dependencies
-        try:
-            import simple_salesforce
-            dependencies["simple_salesforce"] = True
-        except ImportError:
-            dependencies["simple_salesforce"] = False
-            
-        try:
-            import github
-            dependencies["github"] = True
-        except ImportError:
-            dependencies["github"] = False
-            
-        try:
-            import jira
-            dependencies["jira"] = True
-        except ImportError:
-            dependencies["jira"] = False
-            
-        try:
-            import openai
-            dependencies["openai"] = True
-        except ImportError:
-            dependencies["openai"] = False
-            
-        return dependencies
+        return dict(_DEPENDENCIES)
     
     async def get_alerts(self, since: Optional[Any] = None) -> List[Dict[str, Any]]:
         """
-        Get current system alerts and monitoring notifications
+        Get current system alerts and monitoring notifications.
+        Alert timestamps are timezone-aware UTC datetimes.
         """
         try:
             alerts = []
             system_health = await self.get_system_health()
+            if system_health.get("status") == "error":
+                raise RuntimeError(f"System health unavailable: {system_health.get('error')}")
+            now = time.time()
+            timestamp = datetime.fromtimestamp(now, tz=timezone.utc)
             
             # Check CPU usage
-            if system_health.get("cpu_percent", 0) > 80:
+            if (cpu_percent := system_health.get("cpu_percent", 0)) > 80:
                 alerts.append({
-                    "id": f"cpu-alert-{int(time.time())}",
+                    "id": f"cpu-alert-{int(now)}",
                     "type": "cpu_high",
-                    "severity": "high" if system_health["cpu_percent"] > 90 else "medium",
-                    "message": f"High CPU usage: {system_health['cpu_percent']:.1f}%",
-                    "timestamp": time.time()
+                    "severity": "high" if cpu_percent > 90 else "medium",
+                    "message": f"High CPU usage: {cpu_percent:.1f}%",
+                    "timestamp": timestamp
                 })
             
             # Check memory usage
-            memory_percent = system_health.get("memory", {}).get("percent", 0)
-            if memory_percent > 85:
+            memory = system_health.get("memory") or {}
+            if (memory_percent := memory.get("percent", 0)) > 85:
                 alerts.append({
-                    "id": f"memory-alert-{int(time.time())}",
+                    "id": f"memory-alert-{int(now)}",
                     "type": "memory_high", 
                     "severity": "high" if memory_percent > 95 else "medium",
                     "message": f"High memory usage: {memory_percent:.1f}%",
-                    "timestamp": time.time()
+                    "timestamp": timestamp
                 })
             
             return alerts
             
         except Exception as e:
-            logger.error(f"Error getting alerts: {e}")
-            return []
+            # Re-raised so the detector keeps its window where it was
+            logger.error("Error getting alerts: {}", e)
+            raise
     
     async def detect_log_anomalies(self, since: Optional[Any] = None) -> List[Dict[str, Any]]:
         """
-        Detect anomalies in system and application logs
+        Detect anomalies in system and application logs.
+        Anomaly timestamps are timezone-aware UTC datetimes.
         """
         try:
             anomalies = []
+            now = time.time()
             
             # Mock log anomaly detection (in real implementation, this would analyze actual logs)
-            if time.time() % 30 < 5:  # Simulate occasional anomalies
+            if now % 30 < 5:  # Simulate occasional anomalies
                 anomalies.append({
-                    "id": f"log-anomaly-{int(time.time())}",
+                    "id": f"log-anomaly-{int(now)}",
                     "type": "error_spike",
                     "severity": "medium",
                     "message": "Unusual increase in error log entries detected",
                     "details": "Error rate increased by 200% in the last 5 minutes",
-                    "timestamp": time.time()
+                    "timestamp": datetime.fromtimestamp(now, tz=timezone.utc)
                 })
             
             return anomalies
             
         except Exception as e:
-            logger.error(f"Error detecting log anomalies: {e}")
-            return []
+            # Re-raised so the detector keeps its window where it was
+            logger.error("Error detecting log anomalies: {}", e)
+            raise
 
     async def get_full_status(self) -> Dict[str, Any]:
         """
         Get comprehensive system and application status
         """
         try:
-            system_health = await self.get_system_health()
-            app_metrics = await self.get_application_metrics()
-            dependencies = await self.check_dependencies()
+            results = await asyncio.gather(
+                self.get_system_health(),
+                self.get_application_metrics(),
+                self.check_dependencies(),
+                return_exceptions=True
+            )
+            now = time.time()
+            system_health, app_metrics, dependencies = [
+                {"status": "error", "error": str(result), "timestamp": now}
+                if isinstance(result, Exception) else result
+                for result in results
+            ]
             
             return {
                 "overall_status": "healthy" if system_health.get("status") == "healthy" else "degraded",
                 "system": system_health,
                 "application": app_metrics,
                 "dependencies": dependencies,
-                "timestamp": time.time()
+                "timestamp": now
             }
             
         except Exception as e:
-            logger.error(f"Error getting full status: {e}")
+            logger.error("Error getting full status: {}", e)
             return {
                 "overall_status": "error",
                 "error": str(e),
@@ -238,6 +279,13 @@ class MonitoringClient:
     
     async def cleanup(self):
         """Cleanup monitoring client resources"""
+        if self._cpu_task is not None:
+            self._cpu_task.cancel()
+            try:
+                await self._cpu_task
+            except asyncio.CancelledError:
+                pass
+            self._cpu_task = None
         logger.info("Monitoring client cleanup complete")
         return True
 
@@ -4,12 +4,97 @@ Handles Salesforce API interactions for monitoring and data retrieval
 """
 
 import asyncio
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Dict, Any, Optional
+from urllib.parse import quote_plus
 from loguru import logger
 import aiohttp
 
 from ..core.config import settings
+from ._backpressure import AIMDLimiter, RequestBudget
+from ._cache import AsyncTTLCache
+from ._threads import run_blocking
+
+# get_* results, shared by every SalesforceClient. The analyzer asks for the same
+# windows over and over while working through a burst of incidents.
+_QUERY_CACHE = AsyncTTLCache(maxsize=256, ttl=30)
+_SINCE_BUCKET_SECONDS = 30
+
+# Governs concurrent calls to the Salesforce API across all clients
+_LIMITER = AIMDLimiter("Salesforce")
+_BUDGET = RequestBudget("Salesforce", requests_per_minute=120)
+
+def _iso_z(dt: datetime) -> str:
+    """Format a UTC datetime as a SOQL datetime literal (whole seconds, trailing Z)"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+
+# Salesforce's datetime format, used for the mock records
+_ISO_TEMPLATE = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+def _utc_iso(timestamp: float) -> str:
+    """Format a POSIX timestamp as a Salesforce-style UTC datetime string"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime(_ISO_TEMPLATE)
+
+# Mock records for demo purposes, each with its age in seconds. Only the
+# timestamps change from call to call; the nested dicts are shared, so
+# treat the returned records as read-only
+_MOCK_APEX_ERRORS = (
+    ({
+        'Id': 'apex_001',
+        'Message': 'System.NullPointerException: Attempt to de-reference a null object',
+        'ApexClass': {'Name': 'AccountTriggerHandler'},
+        'MethodName': 'updateAccountStatus',
+        'Line': 42,
+        'StackTrace': 'Class.AccountTriggerHandler.updateAccountStatus: line 42, column 1'
+    }, 900),
+    ({
+        'Id': 'apex_002',
+        'Message': 'System.DmlException: FIELD_CUSTOM_VALIDATION_EXCEPTION',
+        'ApexClass': {'Name': 'OpportunityService'},
+        'MethodName': 'validateOpportunity',
+        'Line': 78,
+        'StackTrace': 'Class.OpportunityService.validateOpportunity: line 78, column 1'
+    }, 480)
+)
+
+_MOCK_FLOW_ERRORS = (
+    ({
+        'Id': 'flow_001',
+        'FlowVersionView': {'MasterLabel': 'Account Update Flow'},
+        'ElementName': 'Update_Account_Record',
+        'ErrorMessage': 'The flow failed to access the database.',
+        'CreatedBy': {'Name': 'System User'}
+    }, 720),
+)
+
+_MOCK_DEPLOYMENTS = (
+    ({
+        'Id': 'deploy_001',
+        'Status': 'Failed',
+        'CreatedBy': {'Name': 'John Developer'},
+        'ErrorMessage': 'Apex class compilation failed',
+        'ComponentFailures': ['AccountTrigger.trigger']
+    }, 1800),
+    ({
+        'Id': 'deploy_002',
+        'Status': 'Succeeded',
+        'CreatedBy': {'Name': 'Jane Developer'},
+        'ErrorMessage': None,
+        'ComponentFailures': []
+    }, 7200)
+)
+
+_MOCK_TEST_RESULTS = (
+    ({
+        'Id': 'test_001',
+        'ApexClass': {'Name': 'AccountTriggerTest'},
+        'MethodName': 'testAccountUpdate',
+        'Outcome': 'Fail',
+        'Message': 'System.AssertException: Assertion Failed',
+        'StackTrace': 'Class.AccountTriggerTest.testAccountUpdate: line 25'
+    }, 1200),
+)
 
 # Optional import - works without this package installed
 try:
@@ -23,6 +108,44 @@ except ImportError:
 class SalesforceClient:
     """Client for Salesforce API interactions"""
     
+    # SOQL for the get_* queries - only the {since} datetime changes between calls
+    _APEX_ERRORS_SOQL = (
+        "SELECT Id, Application, DurationMilliseconds, Location, LogLength, "
+        "LogUser.Name, Operation, Request, StartTime, Status, "
+        "SystemModstamp, ApexClass.Name, MethodName, Line, Message, StackTrace "
+        "FROM ApexLog "
+        "WHERE StartTime >= {since} AND Status = 'Failed' "
+        "ORDER BY StartTime DESC LIMIT 100"
+    )
+    _FLOW_ERRORS_SOQL = (
+        "SELECT Id, FlowVersionView.MasterLabel, ElementName, ErrorMessage, "
+        "CreatedDate, CreatedBy.Name "
+        "FROM FlowExecutionErrorEvent "
+        "WHERE CreatedDate >= {since} "
+        "ORDER BY CreatedDate DESC LIMIT 100"
+    )
+    _DEPLOYMENTS_SOQL = (
+        "SELECT Id, Status, CreatedDate, CreatedBy.Name, CompletedDate, "
+        "ErrorMessage, ComponentFailures "
+        "FROM DeployRequest "
+        "WHERE CreatedDate >= {since} "
+        "ORDER BY CreatedDate DESC LIMIT 50"
+    )
+    _FAILED_DEPLOYMENTS_SOQL = (
+        "SELECT Id, Status, CreatedDate, CreatedBy.Name, CompletedDate, "
+        "ErrorMessage, ComponentFailures "
+        "FROM DeployRequest "
+        "WHERE CreatedDate >= {since} AND Status = 'Failed' "
+        "ORDER BY CreatedDate DESC LIMIT 50"
+    )
+    _TEST_RESULTS_SOQL = (
+        "SELECT Id, ApexClass.Name, MethodName, Outcome, Message, "
+        "StackTrace, TestTimestamp, SystemModstamp "
+        "FROM ApexTestResult "
+        "WHERE SystemModstamp >= {since} AND Outcome = 'Fail' "
+        "ORDER BY SystemModstamp DESC LIMIT 100"
+    )
+    
     def __init__(self):
         self.sf = None
         self.session = None
@@ -48,7 +171,7 @@ class SalesforceClient:
             logger.info("Salesforce client initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize Salesforce client: {e}")
+            logger.error("Failed to initialize Salesforce client: {}", e)
             # Continue with mock data for demo purposes
     
     async def cleanup(self):
@@ -62,25 +185,10 @@ class SalesforceClient:
             if not self.sf:
                 return self._mock_apex_errors()
             
-            # Query ApexLog for errors
-            since_str = since.strftime('%Y-%m-%dT%H:%M:%SZ')
-            
-            query = f"""
-            SELECT Id, Application, DurationMilliseconds, Location, LogLength, 
-                   LogUser.Name, Operation, Request, StartTime, Status, 
-                   SystemModstamp, ApexClass.Name, MethodName, Line, Message, StackTrace
-            FROM ApexLog 
-            WHERE StartTime >= {since_str} 
-            AND Status = 'Failed'
-            ORDER BY StartTime DESC
-            LIMIT 100
-            """
-            
-            result = self.sf.query(query)
-            return result['records']
+            return await self._cached_query("apex_errors", self._apex_errors_query, since)
             
         except Exception as e:
-            logger.error(f"Error fetching Apex errors: {e}")
+            logger.error("Error fetching Apex errors: {}", e)
             return self._mock_apex_errors()
     
     async def get_flow_errors(self, since: datetime) -> List[Dict[str, Any]]:
@@ -89,22 +197,10 @@ class SalesforceClient:
             if not self.sf:
                 return self._mock_flow_errors()
             
-            since_str = since.strftime('%Y-%m-%dT%H:%M:%SZ')
-            
-            query = f"""
-            SELECT Id, FlowVersionView.MasterLabel, ElementName, ErrorMessage, 
-                   CreatedDate, CreatedBy.Name
-            FROM FlowExecutionErrorEvent 
-            WHERE CreatedDate >= {since_str}
-            ORDER BY CreatedDate DESC
-            LIMIT 100
-            """
-            
-            result = self.sf.query(query)
-            return result['records']
+            return await self._cached_query("flow_errors", self._flow_errors_query, since)
             
         except Exception as e:
-            logger.error(f"Error fetching Flow errors: {e}")
+            logger.error("Error fetching Flow errors: {}", e)
             return self._mock_flow_errors()
     
     async def get_recent_deployments(self, since: datetime) -> List[Dict[str, Any]]:
@@ -113,22 +209,10 @@ class SalesforceClient:
             if not self.sf:
                 return self._mock_deployments()
             
-            since_str = since.strftime('%Y-%m-%dT%H:%M:%SZ')
-            
-            query = f"""
-            SELECT Id, Status, CreatedDate, CreatedBy.Name, CompletedDate,
-                   ErrorMessage, ComponentFailures
-            FROM DeployRequest 
-            WHERE CreatedDate >= {since_str}
-            ORDER BY CreatedDate DESC
-            LIMIT 50
-            """
-            
-            result = self.sf.query(query)
-            return result['records']
+            return await self._cached_query("deployments", self._deployments_query, since)
             
         except Exception as e:
-            logger.error(f"Error fetching deployments: {e}")
+            logger.error("Error fetching deployments: {}", e)
             return self._mock_deployments()
     
     async def get_test_results(self, since: datetime) -> List[Dict[str, Any]]:
@@ -137,93 +221,155 @@ class SalesforceClient:
             if not self.sf:
                 return self._mock_test_results()
             
-            since_str = since.strftime('%Y-%m-%dT%H:%M:%SZ')
-            
-            query = f"""
-            SELECT Id, ApexClass.Name, MethodName, Outcome, Message, 
-                   StackTrace, TestTimestamp, SystemModstamp
-            FROM ApexTestResult 
-            WHERE SystemModstamp >= {since_str}
-            AND Outcome = 'Fail'
-            ORDER BY SystemModstamp DESC
-            LIMIT 100
-            """
-            
-            result = self.sf.query(query)
-            return result['records']
+            return await self._cached_query("test_results", self._test_results_query, since)
             
         except Exception as e:
-            logger.error(f"Error fetching test results: {e}")
+            logger.error("Error fetching test results: {}", e)
             return self._mock_test_results()
     
+    async def _cached_query(self, name: str, build_query, since: datetime) -> List[Dict[str, Any]]:
+        """
+        Run one of the get_* queries through the shared cache.
+        `since` is rounded down to a 30 second bucket, so calls made moments
+        apart share an entry; the query itself uses the bucketed time too, so
+        the cached rows are exactly what that key promises (a few seconds more
+        history than asked for, never less).
+        """
+        since = since.replace(second=since.second // _SINCE_BUCKET_SECONDS * _SINCE_BUCKET_SECONDS, microsecond=0)
+        
+        async def fetch() -> List[Dict[str, Any]]:
+            return [record async for record in self.iter_records(build_query(since))]
+        
+        return await _QUERY_CACHE.get_or_fetch((name, since.isoformat()), fetch)
+    
+    async def iter_records(self, soql: str, limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the records of a SOQL query one result page at a time, following
+        nextRecordsUrl. Each page fetch holds a limiter slot only while it runs,
+        so a consumer that stops early - or passes `limit` - keeps nothing
+        tied up, and later pages are never requested.
+        """
+        remaining = limit
+        if remaining is not None and remaining <= 0:
+            return
+        
+        page = await self._fetch_page(self.sf.query, soql)
+        while True:
+            records = page["records"]
+            if remaining is not None:
+                records = records[:remaining]
+                remaining -= len(records)
+            for record in records:
+                yield record
+            
+            if page.get("done", True) or remaining == 0:
+                return
+            page = await self._fetch_page(self.sf.query_more, page["nextRecordsUrl"], identifier_is_url=True)
+    
+    async def _fetch_page(self, fetch, *args, **kwargs) -> Dict[str, Any]:
+        """One query/queryMore call, inside the request budget and the limiter"""
+        await _BUDGET.acquire()
+        async with _LIMITER.slot():
+            page = await run_blocking(fetch, *args, **kwargs)
+        self._track_api_usage()
+        return page
+    
+    async def composite_query(self, since: datetime) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run the Apex error, Flow error, deployment and test result queries in a
+        single composite/batch request - one round trip instead of four.
+        Returns the records keyed by "apex_errors", "flow_errors", "deployments"
+        and "test_results". Like the other queries, "deployments" only holds
+        failures, so nothing that gets thrown away is sent over.
+        Mock data is returned only when Salesforce isn't configured. A failed
+        request or sub-query raises, so the detector knows not to move its
+        polling window past records it never received.
+        """
+        if not self.sf:
+            return {
+                "apex_errors": self._mock_apex_errors(),
+                "flow_errors": self._mock_flow_errors(),
+                "deployments": self._mock_deployments(),
+                "test_results": self._mock_test_results()
+            }
+        
+        queries = {
+            "apex_errors": self._apex_errors_query(since),
+            "flow_errors": self._flow_errors_query(since),
+            "deployments": self._deployments_query(since, failed_only=True),
+            "test_results": self._test_results_query(since)
+        }
+        
+        batch = {
+            "batchRequests": [
+                {"method": "GET", "url": f"v{self.sf.sf_version}/query?q={quote_plus(query)}"}
+                for query in queries.values()
+            ]
+        }
+        await _BUDGET.acquire()
+        async with _LIMITER.slot():
+            response = await run_blocking(self.sf.restful, "composite/batch", method="POST", json=batch)
+        self._track_api_usage()
+        
+        results = response.get("results", [])
+        if len(results) != len(queries):
+            raise RuntimeError(f"Salesforce composite query answered {len(results)} of {len(queries)} sub-queries")
+        
+        records = {}
+        for name, sub_result in zip(queries, results):
+            if sub_result.get("statusCode") != 200:
+                raise RuntimeError(f"Error fetching {name} in composite query: {sub_result.get('result')}")
+            records[name] = sub_result["result"]["records"]
+        
+        return records
+    
+    def _track_api_usage(self):
+        """
+        Feed the org's API usage into the request budget. simple_salesforce parses
+        the Sforce-Limit-Info header (api-usage=used/total) of every response into
+        sf.api_usage
+        """
+        usage = (getattr(self.sf, 'api_usage', None) or {}).get('api-usage')
+        if usage:
+            _BUDGET.observe_usage(usage.used, usage.total)
+    
+    def _apex_errors_query(self, since: datetime) -> str:
+        """Build the SOQL for failed Apex executions"""
+        return self._APEX_ERRORS_SOQL.format(since=_iso_z(since))
+    
+    def _flow_errors_query(self, since: datetime) -> str:
+        """Build the SOQL for Flow execution errors"""
+        return self._FLOW_ERRORS_SOQL.format(since=_iso_z(since))
+    
+    def _deployments_query(self, since: datetime, failed_only: bool = False) -> str:
+        """Build the SOQL for recent deployments, optionally just the failed ones"""
+        template = self._FAILED_DEPLOYMENTS_SOQL if failed_only else self._DEPLOYMENTS_SOQL
+        return template.format(since=_iso_z(since))
+    
+    def _test_results_query(self, since: datetime) -> str:
+        """Build the SOQL for failed Apex tests"""
+        return self._TEST_RESULTS_SOQL.format(since=_iso_z(since))
+    
     def _mock_apex_errors(self) -> List[Dict[str, Any]]:
         """Mock Apex errors for demo purposes"""
-        return [
-            {
-                'Id': 'apex_001',
-                'Message': 'System.NullPointerException: Attempt to de-reference a null object',
-                'CreatedDate': (datetime.utcnow() - timedelta(minutes=15)).isoformat() + 'Z',
-                'ApexClass': {'Name': 'AccountTriggerHandler'},
-                'MethodName': 'updateAccountStatus',
-                'Line': 42,
-                'StackTrace': 'Class.AccountTriggerHandler.updateAccountStatus: line 42, column 1'
-            },
-            {
-                'Id': 'apex_002', 
-                'Message': 'System.DmlException: FIELD_CUSTOM_VALIDATION_EXCEPTION',
-                'CreatedDate': (datetime.utcnow() - timedelta(minutes=8)).isoformat() + 'Z',
-                'ApexClass': {'Name': 'OpportunityService'},
-                'MethodName': 'validateOpportunity',
-                'Line': 78,
-                'StackTrace': 'Class.OpportunityService.validateOpportunity: line 78, column 1'
-            }
-        ]
+        now = time.time()
+        return [{**record, 'CreatedDate': _utc_iso(now - age)} for record, age in _MOCK_APEX_ERRORS]
     
     def _mock_flow_errors(self) -> List[Dict[str, Any]]:
         """Mock Flow errors for demo purposes"""
-        return [
-            {
-                'Id': 'flow_001',
-                'FlowVersionView': {'MasterLabel': 'Account Update Flow'},
-                'ElementName': 'Update_Account_Record',
-                'ErrorMessage': 'The flow failed to access the database.',
-                'CreatedDate': (datetime.utcnow() - timedelta(minutes=12)).isoformat() + 'Z',
-                'CreatedBy': {'Name': 'System User'}
-            }
-        ]
+        now = time.time()
+        return [{**record, 'CreatedDate': _utc_iso(now - age)} for record, age in _MOCK_FLOW_ERRORS]
     
     def _mock_deployments(self) -> List[Dict[str, Any]]:
         """Mock deployment data for demo purposes"""
-        return [
-            {
-                'Id': 'deploy_001',
-                'Status': 'Failed',
-                'CreatedDate': (datetime.utcnow() - timedelta(minutes=30)).isoformat() + 'Z',
-                'CreatedBy': {'Name': 'John Developer'},
-                'ErrorMessage': 'Apex class compilation failed',
-                'ComponentFailures': ['AccountTrigger.trigger']
-            },
-            {
-                'Id': 'deploy_002',
-                'Status': 'Succeeded',
-                'CreatedDate': (datetime.utcnow() - timedelta(hours=2)).isoformat() + 'Z',
-                'CreatedBy': {'Name': 'Jane Developer'},
-                'ErrorMessage': None,
-                'ComponentFailures': []
-            }
-        ]
+        now = time.time()
+        return [{**record, 'CreatedDate': _utc_iso(now - age)} for record, age in _MOCK_DEPLOYMENTS]
     
     def _mock_test_results(self) -> List[Dict[str, Any]]:
         """Mock test results for demo purposes"""
-        return [
-            {
-                'Id': 'test_001',
-                'ApexClass': {'Name': 'AccountTriggerTest'},
-                'MethodName': 'testAccountUpdate',
-                'Outcome': 'Fail',
-                'Message': 'System.AssertException: Assertion Failed',
-                'StackTrace': 'Class.AccountTriggerTest.testAccountUpdate: line 25',
-                'TestTimestamp': (datetime.utcnow() - timedelta(minutes=20)).isoformat() + 'Z',
-                'SystemModstamp': (datetime.utcnow() - timedelta(minutes=20)).isoformat() + 'Z'
-            }
-        ]
+        now = time.time()
+        results = []
+        for record, age in _MOCK_TEST_RESULTS:
+            ran_at = _utc_iso(now - age)
+            results.append({**record, 'TestTimestamp': ran_at, 'SystemModstamp': ran_at})
+        return results
@@ -3,22 +3,73 @@ Slack integration client for team notifications and alerts
 Sends notifications about incidents, status updates, and system alerts to Slack channels
 """
 
-try:
-    from slack_sdk import WebClient
-    from slack_sdk.errors import SlackApiError
-    SLACK_AVAILABLE = True
-except ImportError:
-    WebClient = None
-    SlackApiError = Exception
-    SLACK_AVAILABLE = False
-    from loguru import logger
-    logger.warning("slack-sdk not installed - Slack integration disabled")
-
 import asyncio
+import importlib.util
 import json
-from typing import Dict, Any, List, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Tuple, Union
 from loguru import logger
+import httpx
+import orjson
 from ..core.config import settings
+from ._backpressure import TokenBucket
+from ._http import HTTPX_SOCKET_OPTIONS
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); without it httpx sticks to HTTP/1.1
+HAS_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_SLACK_API_URL = "https://slack.com/api/"
+# Slack warns about JSON bodies sent without an explicit charset
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+# Most messages waiting to be posted before new ones are dropped
+_QUEUE_SIZE = 1000
+
+# Messages queued within this many seconds of each other are posted together,
+# up to this many per post (a header plus one section each stays well under
+# Slack's 50-block limit)
+_BATCH_WINDOW = 2.0
+_BATCH_SIZE = 20
+
+# Message blocks, either as a list or already serialized to JSON (see _message_body)
+_Blocks = Union[List[Dict], bytes, None]
+
+# (channel, text, blocks, summary) - see SlackClient._enqueue
+_QueuedMessage = Tuple[str, str, _Blocks, str]
+
+# Slack allows about one message per second per channel, with short bursts
+_CHANNEL_RATE = 1.0
+_CHANNEL_BURST = 5
+
+# How long channel name -> ID lookups are trusted before listing channels again
+_CHANNEL_CACHE_TTL = 600
+
+# A successful auth.test is trusted for this long, so health checks don't
+# spend Slack rate limit re-checking a token that just worked
+_AUTH_CACHE_TTL = 60
+
+# Errors meaning the token itself is no good - a cached auth.test result is stale
+_AUTH_ERRORS = frozenset({"invalid_auth", "token_revoked", "account_inactive", "not_authed"})
+
+# Default cap on chat.postMessage calls in flight at once (see set_max_concurrency)
+_MAX_CONCURRENCY = 8
+
+def _message_body(channel: str, message: str, blocks: _Blocks) -> bytes:
+    """
+    JSON body for chat.postMessage. Blocks that are already bytes are spliced in
+    as they are - a fan-out serializes its blocks once for every channel
+    """
+    if isinstance(blocks, bytes):
+        return b"".join((
+            b'{"channel":', orjson.dumps(channel),
+            b',"text":', orjson.dumps(message),
+            b',"blocks":', blocks, b"}"
+        ))
+    payload = {"channel": channel, "text": message}
+    if blocks is not None:
+        payload["blocks"] = blocks
+    return orjson.dumps(payload)
 
 class SlackClient:
     """
@@ -29,59 +80,142 @@ class SlackClient:
         """Initialize Slack client if token is available"""
         self.client = None
         self.enabled = False
+        # Alerts and status updates are posted by a background worker, so
+        # callers don't wait on Slack's round trip
+        self._queue: "asyncio.Queue[_QueuedMessage]" = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        self._worker: Optional[asyncio.Task] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._channel_ids: Dict[str, str] = {}
+        self._channel_ids_loaded = float("-inf")
+        self._channel_lock = asyncio.Lock()
+        self._post_condition = asyncio.Condition()
+        self._in_flight = 0
+        self._max_concurrency = _MAX_CONCURRENCY
+        self._auth_ok_until = float("-inf")
         
-        if not SLACK_AVAILABLE:
-            logger.warning("Slack SDK not available - notifications disabled")
-            return
-            
         if settings.SLACK_BOT_TOKEN:
-            try:
-                self.client = WebClient(token=settings.SLACK_BOT_TOKEN)
-                self.enabled = True
-                logger.info("Slack client initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Slack client: {e}")
+            self.enabled = True
+            logger.info("Slack client initialized successfully")
         else:
             logger.warning("SLACK_BOT_TOKEN not configured - Slack notifications disabled")
     
     async def initialize(self):
         """Initialize the Slack client (async setup if needed)"""
         if self.enabled:
+            # Every call goes to slack.com, so one persistent pool carries them
+            # all - multiplexed over a single HTTP/2 connection when h2 is
+            # installed - instead of a TCP+TLS handshake per burst
+            self.client = httpx.AsyncClient(
+                base_url=_SLACK_API_URL,
+                headers={"Authorization": f"Bearer {settings.SLACK_BOT_TOKEN}"},
+                timeout=10.0,
+                transport=httpx.AsyncHTTPTransport(
+                    http2=HAS_HTTP2,
+                    limits=httpx.Limits(max_keepalive_connections=32, max_connections=32),
+                    socket_options=HTTPX_SOCKET_OPTIONS
+                )
+            )
+            self._worker = asyncio.create_task(self._drain())
             logger.info("Slack client initialization complete")
         return True
     
-    async def send_message(self, channel: str, message: str, blocks: Optional[List[Dict]] = None) -> bool:
+    async def send_message(self, channel: str, message: str, blocks: _Blocks = None) -> bool:
         """
         Send a message to a Slack channel
         """
-        if not self.enabled:
+        if not self.enabled or self.client is None:
             logger.warning("Slack not enabled - message not sent")
             return False
             
         try:
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.chat_postMessage(
-                    channel=channel,
-                    text=message,
-                    blocks=blocks
+            if channel.startswith("#"):
+                channel = await self._resolve_channel(channel)
+            
+            async with self._post_slot():
+                response = await self._api_call(
+                    "chat.postMessage", body=_message_body(channel, message, blocks)
                 )
-            )
             
             if response["ok"]:
-                logger.info(f"Message sent to Slack channel {channel}")
+                logger.info("Message sent to Slack channel {}", channel)
                 return True
             else:
-                logger.error(f"Failed to send Slack message: {response.get('error')}")
+                error = response.get("error")
+                if error in _AUTH_ERRORS:
+                    self._auth_ok_until = float("-inf")
+                logger.error("Failed to send Slack message: {}", error)
                 return False
                 
-        except SlackApiError as e:
-            logger.error(f"Slack API error: {e.response['error']}")
-            return False
         except Exception as e:
-            logger.error(f"Error sending Slack message: {e}")
+            logger.error("Error sending Slack message: {}", e)
             return False
     
+    async def _api_call(self, method: str, params: Optional[Dict[str, Any]] = None,
+                        body: Optional[bytes] = None) -> Dict[str, Any]:
+        """
+        Call a Slack Web API method and return its decoded response. Writes POST a
+        ready-made JSON `body`; reads use GET with `params` (None values left out)
+        """
+        if body is not None:
+            response = await self.client.post(method, content=body, headers=_JSON_HEADERS)
+        else:
+            params = {key: value for key, value in (params or {}).items() if value is not None}
+            response = await self.client.get(method, params=params)
+        # Slack answers errors (rate limits included) with an {"ok": false, "error": ...} body
+        return orjson.loads(response.content)
+    
+    @asynccontextmanager
+    async def _post_slot(self):
+        """Wait until fewer than the allowed number of posts are in flight, then hold one"""
+        async with self._post_condition:
+            await self._post_condition.wait_for(lambda: self._in_flight < self._max_concurrency)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._post_condition:
+                self._in_flight -= 1
+                self._post_condition.notify(1)
+    
+    async def set_max_concurrency(self, limit: int):
+        """
+        Change how many messages may be posted at once. Takes effect immediately:
+        raising it wakes waiting senders, lowering it holds new posts back until
+        enough of the ones in flight have finished
+        """
+        async with self._post_condition:
+            self._max_concurrency = max(1, limit)
+            self._post_condition.notify_all()
+    
+    async def _resolve_channel(self, name: str) -> str:
+        """
+        Map a "#name" to its channel ID, listing the workspace's channels at most
+        once every 10 minutes. Unknown names (or a failed lookup) are returned
+        unchanged - Slack still accepts them, just more slowly.
+        """
+        async with self._channel_lock:
+            if time.monotonic() - self._channel_ids_loaded > _CHANNEL_CACHE_TTL:
+                try:
+                    channel_ids = {}
+                    cursor = None
+                    while True:
+                        response = await self._api_call(
+                            "conversations.list",
+                            {"limit": 1000, "exclude_archived": "true", "cursor": cursor}
+                        )
+                        for conversation in response["channels"]:
+                            channel_ids[f"#{conversation['name']}"] = conversation["id"]
+                        cursor = response.get("response_metadata", {}).get("next_cursor")
+                        if not cursor:
+                            break
+                    self._channel_ids = channel_ids
+                except Exception as e:
+                    logger.warning("Couldn't list Slack channels, posting by name: {}", e)
+                # Don't retry a failed listing on every message either
+                self._channel_ids_loaded = time.monotonic()
+        
+        return self._channel_ids.get(name, name)
+    
     async def send_incident_alert(self, incident: Dict[str, Any]) -> bool:
         """
         Send an incident alert to Slack with formatted blocks
@@ -90,69 +224,75 @@ class SlackClient:
             return False
             
         try:
-            severity_color = {
-                "critical": "#FF0000",
-                "high": "#FF6600", 
-                "medium": "#FFCC00",
-                "low": "#00CC00"
-            }.get(incident.get("severity", "medium"), "#FFCC00")
-            
-            blocks = [
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": f"Incident Alert: {incident.get('title', 'Unknown Issue')}"
-                    }
-                },
-                {
-                    "type": "section",
-                    "fields": [
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Severity:* {incident.get('severity', 'Unknown')}"
-                        },
-                        {
-                            "type": "mrkdwn", 
-                            "text": f"*Source:* {incident.get('source', 'Unknown')}"
-                        },
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Status:* {incident.get('status', 'New')}"
-                        },
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*ID:* {incident.get('id', 'N/A')}"
-                        }
-                    ]
-                }
-            ]
-            
-            if incident.get("description"):
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*Description:*\n{incident['description']}"
-                    }
-                })
-            
-            if incident.get("ai_analysis"):
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn", 
-                        "text": f"*AI Analysis:*\n{incident['ai_analysis']}"
-                    }
-                })
+            return await self._enqueue("#alerts", *self._build_incident_alert(incident))
             
-            message = f"Incident Alert: {incident.get('title', 'Unknown Issue')} - Severity: {incident.get('severity', 'Unknown')}"
+        except Exception as e:
+            logger.error("Error sending incident alert: {}", e)
+            return False
+    
+    async def send_incident_alert_fanout(self, incident: Dict[str, Any], channels: List[str]) -> List[bool]:
+        """
+        Send the same incident alert to several channels. The blocks are built
+        once and the channels are sent to concurrently, so a fan-out costs one
+        Slack round trip rather than one per channel
+        """
+        if not self.enabled:
+            return [False] * len(channels)
             
-            return await self.send_message("#alerts", message, blocks)
+        try:
+            message, blocks, summary = self._build_incident_alert(incident)
+            # Every channel gets the same blocks - serialize them just once
+            blocks = orjson.dumps(blocks)
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(self._enqueue(channel, message, blocks, summary))
+                    for channel in channels
+                ]
+            return [task.result() for task in tasks]
             
         except Exception as e:
-            logger.error(f"Error sending incident alert: {e}")
-            return False
+            logger.error("Error sending incident alert: {}", e)
+            return [False] * len(channels)
+    
+    @staticmethod
+    def _build_incident_alert(incident: Dict[str, Any]) -> Tuple[str, List[Dict], str]:
+        """(text, blocks, summary) for an incident alert - see _enqueue"""
+        # The layout never changes, so it's written out in full: each incident
+        # field is read once and every block is a literal, leaving no table to
+        # loop over or re-read per alert
+        get = incident.get
+        title = get("title", "Unknown Issue")
+        severity = get("severity", "Unknown")
+        header = f"Incident Alert: {title}"
+        severity_field = f"*Severity:* {severity}"
+        source_field = f"*Source:* {get('source', 'Unknown')}"
+        status_field = f"*Status:* {get('status', 'New')}"
+        id_field = f"*ID:* {get('id', 'N/A')}"
+        
+        blocks = [
+            {"type": "header", "text": {"type": "plain_text", "text": header}},
+            {
+                "type": "section",
+                "fields": [
+                    {"type": "mrkdwn", "text": severity_field},
+                    {"type": "mrkdwn", "text": source_field},
+                    {"type": "mrkdwn", "text": status_field},
+                    {"type": "mrkdwn", "text": id_field}
+                ]
+            }
+        ]
+        
+        if description := get("description"):
+            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": f"*Description:*\n{description}"}})
+        
+        if ai_analysis := get("ai_analysis"):
+            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": f"*AI Analysis:*\n{ai_analysis}"}})
+        
+        message = f"{header} - Severity: {severity}"
+        # One-section version, used when several alerts are posted together
+        summary = f"*{title}*\n{severity_field} | {source_field} | {status_field} | {id_field}"
+        
+        return message, blocks, summary
     
     async def send_status_update(self, message: str, channel: str = "#general") -> bool:
         """
@@ -172,38 +312,137 @@ class SlackClient:
                 }
             ]
             
-            return await self.send_message(channel, f"System Status: {message}", blocks)
+            return await self._enqueue(channel, f"System Status: {message}", blocks, blocks[0]["text"]["text"])
             
         except Exception as e:
-            logger.error(f"Error sending status update: {e}")
+            logger.error("Error sending status update: {}", e)
+            return False
+    
+    async def _enqueue(self, channel: str, message: str, blocks: _Blocks = None,
+                       summary: Optional[str] = None) -> bool:
+        """
+        Queue a message for the background worker. Returns as soon as it's queued;
+        without a running worker (initialize() not called) it's sent right away.
+        `summary` is the mrkdwn that stands in for the message when it's batched
+        with others (defaults to the plain text).
+        """
+        if self._worker is None:
+            return await self.send_message(channel, message, blocks)
+        
+        try:
+            self._queue.put_nowait((channel, message, blocks, summary or message))
+            return True
+        except asyncio.QueueFull:
+            logger.warning("Slack queue full - dropping message for {}", channel)
             return False
     
+    async def _drain(self):
+        """
+        Background worker: post queued messages. Messages arriving within two
+        seconds of each other go out as one post per channel
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + _BATCH_WINDOW
+            while len(batch) < _BATCH_SIZE and (timeout := deadline - loop.time()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                by_channel: Dict[str, List[_QueuedMessage]] = {}
+                for queued in batch:
+                    by_channel.setdefault(queued[0], []).append(queued)
+                
+                # Each channel is paced separately, so post to them all at once
+                async with asyncio.TaskGroup() as tg:
+                    for channel, queued in by_channel.items():
+                        tg.create_task(self._post_queued(channel, queued))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _post_queued(self, channel: str, queued: List[_QueuedMessage]):
+        """Post one channel's share of a batch, merged into a single message if there are several"""
+        try:
+            if len(queued) == 1:
+                _, message, blocks, _ = queued[0]
+                await self._dispatch(channel, message, blocks)
+            else:
+                await self._dispatch(channel, *self._merge(queued))
+        except Exception as e:
+            logger.error("Error posting queued Slack messages: {}", e)
+    
+    @staticmethod
+    def _merge(queued: List[_QueuedMessage]) -> Tuple[str, List[Dict]]:
+        """Combine several queued messages into one: a header, then a section for each"""
+        blocks = [{
+            "type": "header",
+            "text": {"type": "plain_text", "text": f"{len(queued)} new notifications"}
+        }]
+        blocks.extend(
+            # Slack caps section text at 3000 characters
+            {"type": "section", "text": {"type": "mrkdwn", "text": summary[:3000]}}
+            for _, _, _, summary in queued
+        )
+        return "\n".join(message for _, message, _, _ in queued), blocks
+    
+    async def _dispatch(self, channel: str, message: str, blocks: _Blocks):
+        """
+        Post one queued message, pacing each channel to Slack's rate limit so we
+        wait a second here rather than get a 429 from chat.postMessage - _api_call
+        doesn't retry, so a rate-limited post would be lost
+        (send_message logs its own failures)
+        """
+        bucket = self._buckets.get(channel)
+        if bucket is None:
+            bucket = self._buckets[channel] = TokenBucket(_CHANNEL_RATE, _CHANNEL_BURST)
+        await bucket.acquire()
+        await self.send_message(channel, message, blocks)
+    
     async def test_connection(self) -> bool:
         """
         Test the Slack connection
         """
-        if not self.enabled:
+        if not self.enabled or self.client is None:
             return False
+        
+        now = time.monotonic()
+        if now < self._auth_ok_until:
+            return True
             
+        # Only successes are cached - a failure is checked again next time
+        self._auth_ok_until = float("-inf")
         try:
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.auth_test()
-            )
+            response = await self._api_call("auth.test")
             
             if response["ok"]:
-                logger.info(f"Slack connection test successful - Bot: {response.get('user')}")
+                logger.info("Slack connection test successful - Bot: {}", response.get('user'))
+                self._auth_ok_until = now + _AUTH_CACHE_TTL
                 return True
             else:
-                logger.error(f"Slack connection test failed: {response.get('error')}")
+                logger.error("Slack connection test failed: {}", response.get('error'))
                 return False
                 
         except Exception as e:
-            logger.error(f"Slack connection test error: {e}")
+            logger.error("Slack connection test error: {}", e)
             return False
     
     async def cleanup(self):
         """Cleanup Slack client resources"""
+        if self._worker:
+            # Let anything already queued go out before shutting down
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=5.0)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out flushing queued Slack messages")
+            self._worker.cancel()
+            self._worker = None
+        if self.client:
+            await self.client.aclose()
+            self.client = None
         logger.info("Slack client cleanup complete")
         return True
 
@@ -2,10 +2,12 @@
 Data models for incidents and signals
 """
 
-from datetime import datetime
+import sys
+import time
+from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from typing import List, Literal, Optional, Dict, Any, Set
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
 class Severity(Enum):
     """Incident severity levels"""
@@ -14,6 +16,32 @@ class Severity(Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
+# Incidents store severity as its plain string, checked against this Literal
+# inside pydantic-core - no Enum lookup and coercion on every construction.
+# Severity members are still accepted and stored as their value
+SeverityValue = Literal["low", "medium", "high", "critical"]
+
+# Default timestamps for analyses and actions come from a clock refreshed at
+# most every 10 ms, so a burst of actions shares one datetime instead of
+# building a new one each - nothing reads these at finer resolution
+_CLOCK_RESOLUTION = 0.01
+_clock_checked = float("-inf")
+_clock_now: Optional[datetime] = None
+
+def _coarse_utcnow() -> datetime:
+    """The current time as an aware UTC datetime, to within 10 ms"""
+    global _clock_checked, _clock_now
+    checked = time.monotonic()
+    if checked - _clock_checked > _CLOCK_RESOLUTION:
+        _clock_checked = checked
+        _clock_now = datetime.now(timezone.utc)
+    return _clock_now
+
+# Signal metadata strings shorter than this are interned: keys and values like
+# class, method and flow names repeat across thousands of signals, and
+# interning keeps one shared copy of each instead of one per signal
+_INTERN_MAX_LENGTH = 64
+
 class IncidentStatus(Enum):
     """Incident status values"""
     DETECTED = "detected"
@@ -33,6 +61,9 @@ class SignalType(Enum):
 
 class Signal(BaseModel):
     """Represents a detected signal/event"""
+    # Detectors build these in bulk, but there's no cheaper layout to switch to:
+    # BaseModel already declares __slots__ and keeps field values in __dict__, and
+    # validating in pydantic-core measures faster than model_construct() here.
     id: str
     type: SignalType
     source: str  # e.g., "salesforce", "github", "copado"
@@ -41,7 +72,18 @@ class Signal(BaseModel):
     severity: Severity
     timestamp: datetime
     metadata: Dict[str, Any] = {}
-    raw_data: Optional[str] = None
+    raw_data: Optional[Any] = None  # the untouched source record - serialize it only if you need to
+
+    model_config = ConfigDict(defer_build=True)
+
+    @field_validator("metadata")
+    @classmethod
+    def _intern_metadata(cls, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Share one copy of each repeated short metadata string"""
+        return {
+            sys.intern(key): sys.intern(value) if type(value) is str and len(value) < _INTERN_MAX_LENGTH else value
+            for key, value in metadata.items()
+        }
 
 class Analysis(BaseModel):
     """AI analysis results"""
@@ -52,7 +94,9 @@ class Analysis(BaseModel):
     suggested_actions: List[str] = []
     code_changes: List[Dict[str, Any]] = []
     impact_assessment: Optional[str] = None
-    analysis_timestamp: datetime = datetime.utcnow()
+    analysis_timestamp: datetime = Field(default_factory=_coarse_utcnow)
+
+    model_config = ConfigDict(defer_build=True)
 
 class Action(BaseModel):
     """Represents an automated action taken"""
@@ -61,16 +105,18 @@ class Action(BaseModel):
     description: str
     status: str  # e.g., "pending", "completed", "failed"
     result: Optional[Dict[str, Any]] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=_coarse_utcnow)
+
+    model_config = ConfigDict(defer_build=True)
 
 class Incident(BaseModel):
     """Main incident model"""
     id: str
     title: str
     description: str
-    severity: Severity
+    severity: SeverityValue
     status: IncidentStatus
-    signals: List[Signal] = []
+    signals: List[Signal] = []  # attach new signals with add_signal(), see below
     analysis: Optional[Analysis] = None
     actions_taken: List[Action] = []
     created_at: datetime
@@ -79,5 +125,72 @@ class Incident(BaseModel):
     assignee: Optional[str] = None
     tags: List[str] = []
     
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, defer_build=True)
+
+    @field_validator("severity", mode="before")
+    @classmethod
+    def _severity_value(cls, severity: Any) -> Any:
+        """Accept a Severity member as well as its string value"""
+        return severity.value if isinstance(severity, Severity) else severity
+
+    # Columns of the two signal fields correlation looks at, kept in step with
+    # `signals` so matching a new signal is a set lookup rather than a scan of
+    # every signal the incident has collected (bursts can add thousands).
+    # add_signal() updates them in place. If `signals` is appended to directly,
+    # reassigned or replaced via model_copy(update=...), the list identity or
+    # length no longer matches what was indexed and matches_signal() rebuilds
+    # them. Edits that keep both (e.g. signals[0] = other) go unnoticed, so
+    # new signals should always go through add_signal()
+    _signal_sources: Set[str] = PrivateAttr(default_factory=set)
+    _signal_components: Set[Optional[str]] = PrivateAttr(default_factory=set)
+    _indexed_signals: Optional[List[Signal]] = PrivateAttr(default=None)
+    _indexed_count: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any):
+        self._index_signals()
+
+    def _index_signals(self):
+        """Rebuild the correlation columns from `signals`"""
+        signals = self.signals
+        self._signal_sources = {signal.source for signal in signals}
+        self._signal_components = {signal.component for signal in signals}
+        self._indexed_signals = signals
+        self._indexed_count = len(signals)
+
+    def _columns_current(self) -> bool:
+        """Were the correlation columns built from the current `signals`?"""
+        return self.signals is self._indexed_signals and len(self.signals) == self._indexed_count
+
+    def add_signal(self, signal: Signal):
+        """
+        Attach another signal to this incident. Use this rather than appending
+        to `signals`, so the correlation columns are updated in place
+        """
+        current = self._columns_current()
+        self.signals.append(signal)
+        if current:
+            self._signal_sources.add(signal.source)
+            self._signal_components.add(signal.component)
+            self._indexed_count += 1
+
+    def matches_signal(self, signal: Signal) -> bool:
+        """Does `signal` share a source or component with one of this incident's signals?"""
+        if not self._columns_current():
+            # `signals` was changed without going through add_signal
+            self._index_signals()
+        return signal.source in self._signal_sources or signal.component in self._signal_components
+
+    # use_enum_values only applies at construction time, so later assignments
+    # (e.g. ``incident.status = IncidentStatus.RESOLVING``) leave an Enum behind.
+    # This gives the response code a plain string either way.
+    @property
+    def status_str(self) -> str:
+        """Status as its plain string value"""
+        status = self.status
+        return status.value if isinstance(status, Enum) else status
+
+    @property
+    def severity_str(self) -> str:
+        """Severity as its plain string value"""
+        severity = self.severity
+        return severity.value if isinstance(severity, Enum) else severity